@@ -0,0 +1,211 @@
+# alarm_import.py
+# Bulk import of alarms from CSV and iCalendar (.ics) files, e.g. shift
+# schedules with thousands of rows. The file is streamed through a chain of
+# generators (lines -> raw rows -> validated alarms -> batches), so only one
+# batch is held in memory at a time whatever the file size:
+#
+#   report = import_alarms(model, "shifts.csv")
+#
+# Rows are checked with the same rules as the Alarm tab (validation.py); bad
+# rows are counted and reported, never shown as dialogs.
+#
+#   CSV:  a "time" (or "alarm"/"start") column, optional "timezone"/"tz" and
+#         "date" columns; without a header row the first column is the time.
+#         Values like 07:30, 7:30:00 or 2024-05-01 07:30 are accepted.
+#   ICS:  DTSTART of every VEVENT. TZID=... and a trailing Z (UTC) become the
+#         alarm's timezone; floating times follow the displayed timezone.
+#
+# A row with a date rings once at that date and time in its zone; a dated row
+# that is already past is rejected. A row without a date rings at the next
+# HH:MM.
+import csv
+import datetime
+import itertools
+import time
+
+import pytz
+
+from recurrence import local_timestamp
+from validation import InputError, parse_alarm_time, parse_clock_text
+
+BATCH_SIZE = 1000  # Alarms per add_alarms() call (and per journal record)
+MAX_ERRORS = 100   # Bad rows kept in the report; the rest are only counted
+
+TIME_COLUMNS = ("time", "alarm", "start", "alarm time", "start time")
+ZONE_COLUMNS = ("timezone", "tz", "zone")
+DATE_COLUMNS = ("date", "day")
+
+
+class ImportReport:
+    """What an import did: rows read, alarms added, and the first few rejected rows."""
+
+    def __init__(self, max_errors=MAX_ERRORS):
+        self.rows = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []  # (line number, message)
+        self.max_errors = max_errors
+
+    def add_error(self, line_no, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_no, message))
+
+    def summary(self):
+        return f"Imported {self.imported} of {self.rows} rows ({self.error_count} rejected)."
+
+
+# --- Stage 1: file -> lines ---
+
+def read_lines(path):
+    """Yields the file's lines one at a time (a BOM from Excel exports is dropped)."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        yield from f
+
+
+# --- Stage 2: lines -> (line number, time text or None, timezone, date text) ---
+
+def csv_rows(lines):
+    reader = csv.reader(lines)
+    time_col, zone_col, date_col = 0, None, None
+    first = True
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        if first:
+            # A header row names the columns; otherwise it is already data
+            first = False
+            names = [cell.strip().lower() for cell in row]
+            if any(name in TIME_COLUMNS for name in names):
+                time_col = next(i for i, name in enumerate(names) if name in TIME_COLUMNS)
+                zone_col = next((i for i, name in enumerate(names) if name in ZONE_COLUMNS), None)
+                date_col = next((i for i, name in enumerate(names) if name in DATE_COLUMNS), None)
+                continue
+        text = row[time_col] if time_col < len(row) else ""
+        zone = row[zone_col].strip() if zone_col is not None and zone_col < len(row) else ""
+        clock, date = _split_date_time(text)
+        if date is None and date_col is not None and date_col < len(row):
+            date = row[date_col].strip() or None
+        yield reader.line_num, clock, zone or None, date
+
+
+def _split_date_time(text):
+    # "2024-05-01 07:30", "2024-05-01T07:30:00" -> ("07:30", "2024-05-01"); seconds are dropped
+    words = text.strip().replace("T", " ").split()
+    clock = words[-1] if words else ""
+    fields = clock.split(":")
+    if len(fields) == 3:
+        clock = ":".join(fields[:2])
+    return clock, (words[0] if len(words) > 1 else None)
+
+
+def _unfold(lines):
+    # RFC 5545: a line starting with a space or tab continues the previous one
+    line_no, current = 0, None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield line_no, current
+        line_no, current = number, line
+    if current is not None:
+        yield line_no, current
+
+
+def ics_rows(lines):
+    in_event = False
+    for line_no, line in _unfold(lines):
+        name, _, value = line.partition(":")
+        name, *params = name.split(";")
+        name = name.upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            in_event = True
+        elif name == "END" and value.upper() == "VEVENT":
+            in_event = False
+        elif name == "DTSTART" and in_event:
+            zone = None
+            for param in params:
+                key, _, param_value = param.partition("=")
+                if key.upper() == "TZID":
+                    zone = param_value.strip('"')
+            value = value.strip()
+            if "T" not in value:
+                yield line_no, None, zone, None  # An all-day event (VALUE=DATE); rejected as having no time
+                continue
+            date, clock = value.split("T", 1)
+            if clock.endswith("Z"):
+                zone = "UTC"
+            yield line_no, f"{clock[0:2]}:{clock[2:4]}", zone, f"{date[0:4]}-{date[4:6]}-{date[6:8]}"
+
+
+# --- Stage 3: validation ---
+
+def _parse_date(text):
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise InputError("Invalid Date", f"Expected a YYYY-MM-DD date, got '{text}'.")
+
+
+def valid_alarms(rows, report, display_tz_name=None, now_ts=None):
+    """
+    Yields (hour, minute, tz_name, date) for every valid row; bad rows go to the
+    report. Dated rows without a zone are checked against display_tz_name
+    (None = local time), the zone they will ring in.
+    """
+    if now_ts is None:
+        now_ts = time.time()
+    display_tz = pytz.timezone(display_tz_name) if display_tz_name else None
+    zones = {}  # Zone name -> pytz zone, or None if unknown
+    for line_no, text, zone, date_text in rows:
+        report.rows += 1
+        try:
+            if text is None:
+                raise InputError("Invalid Time", "All-day events have no alarm time.")
+            hour, minute = parse_alarm_time(*parse_clock_text(text, 2))
+            tz = display_tz
+            if zone is not None:
+                if zone not in zones:
+                    zones[zone] = pytz.timezone(zone) if zone in pytz.all_timezones_set else None
+                tz = zones[zone]
+                if tz is None:
+                    raise InputError("Invalid Timezone", f"Unknown timezone '{zone}'.")
+            date = None
+            if date_text is not None:
+                date = _parse_date(date_text)
+                # Same rule as the Alarm tab: the minute in progress still counts
+                if local_timestamp(date, hour, minute, tz) + 60 <= now_ts:
+                    raise InputError("Alarm In The Past", f"{date.isoformat()} {hour:02d}:{minute:02d} has already passed.")
+        except InputError as e:
+            report.add_error(line_no, e.message)
+            continue
+        yield hour, minute, zone, date
+
+
+# --- Stage 4: batches -> model ---
+
+def batches(items, size=BATCH_SIZE):
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def rows_for(path):
+    """Picks the row reader by extension: .ics/.ical is iCalendar, anything else CSV."""
+    if path.lower().endswith((".ics", ".ical")):
+        return ics_rows(read_lines(path))
+    return csv_rows(read_lines(path))
+
+
+def import_alarms(model, path, batch_size=BATCH_SIZE, max_errors=MAX_ERRORS):
+    """Streams the file into model.add_alarms() and returns an ImportReport. OSError propagates."""
+    report = ImportReport(max_errors)
+    alarms = valid_alarms(rows_for(path), report, model.get_alarm_timezone())
+    for batch in batches(alarms, batch_size):
+        report.imported += len(model.add_alarms(batch))
+    return report
@@ -0,0 +1,224 @@
+# alarms.py
+import datetime
+import heapq
+import itertools
+import pytz
+
+from recurrence import local_instants, local_timestamp
+
+
+def next_fire_timestamp(hour, minute, tz_name, now_ts):
+    """
+    Returns the UNIX timestamp of the next HH:MM wall time in the given zone
+    (None = local time). The minute currently in progress still counts, matching
+    the old hour/minute comparison in check_alarm. DST gaps are resolved as in
+    recurrence.local_timestamp(); in an overlap whose first pass is over, the
+    second pass is still today.
+    """
+    if tz_name:
+        tz = pytz.timezone(tz_name)
+        now_local = datetime.datetime.fromtimestamp(now_ts, tz)
+    else:
+        tz = None
+        now_local = datetime.datetime.fromtimestamp(now_ts)
+
+    day = now_local.date()
+    for _ in range(2):
+        for fire_ts in local_instants(day, hour, minute, tz):
+            if fire_ts + 60 > now_ts:
+                return fire_ts
+        day += datetime.timedelta(days=1)
+    return fire_ts
+
+
+class Alarm:
+    """
+    A single alarm. tz_name None means 'follow the displayed timezone'; rule
+    (a recurrence.Rule) None means it fires once; date (a datetime.date) pins a
+    one-shot alarm to that day instead of the next HH:MM.
+    """
+
+    def __init__(self, alarm_id, hour, minute, tz_name=None, rule=None, date=None):
+        self.alarm_id = alarm_id
+        self.hour = hour
+        self.minute = minute
+        self.tz_name = tz_name
+        self.rule = rule
+        self.date = date
+        self.fire_ts = None
+        self._seq = None  # Identifies the live heap entry (older entries are stale)
+
+    def get_time_string(self):
+        return f"{self.hour:02d}:{self.minute:02d}"
+
+    def to_dict(self):
+        return {
+            "id": self.alarm_id,
+            "time": self.get_time_string(),
+            "tz": self.tz_name,
+            "fire_ts": self.fire_ts,
+            "repeat": None if self.rule is None else self.rule.describe(),
+            "date": None if self.date is None else self.date.isoformat(),
+        }
+
+
+class AlarmQueue:
+    """
+    Alarm index kept as a heap ordered by next fire instant. Each check only
+    looks at the heap head, so the per-tick cost does not depend on how many
+    alarms are set. Removal is lazy: the alarm is dropped from the dict and its
+    heap entry is discarded when it reaches the head. A repeating alarm is
+    pushed back with its next occurrence as soon as it fires.
+    """
+
+    def __init__(self, display_tz_name=None):
+        self._heap = []
+        self._alarms = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._display_tz_name = display_tz_name
+
+    def __len__(self):
+        return len(self._alarms)
+
+    def __contains__(self, alarm_id):
+        return alarm_id in self._alarms
+
+    def _zone_for(self, alarm):
+        return alarm.tz_name if alarm.tz_name is not None else self._display_tz_name
+
+    def _next_fire_ts(self, alarm, now_ts, fired_ts=None):
+        if alarm.date is not None:
+            zone = self._zone_for(alarm)
+            return local_timestamp(alarm.date, alarm.hour, alarm.minute, pytz.timezone(zone) if zone else None)
+        if alarm.rule is not None:
+            return alarm.rule.next_fire_ts(alarm.hour, alarm.minute, self._zone_for(alarm), now_ts, fired_ts)
+        return next_fire_timestamp(alarm.hour, alarm.minute, self._zone_for(alarm), now_ts)
+
+    def _push(self, alarm, now_ts, fire_ts=None):
+        if fire_ts is None:
+            fire_ts = self._next_fire_ts(alarm, now_ts)
+        alarm.fire_ts = fire_ts
+        alarm._seq = next(self._seq)
+        heapq.heappush(self._heap, (alarm.fire_ts, alarm._seq, alarm.alarm_id))
+
+    def _drop_stale_head(self):
+        heap = self._heap
+        while heap:
+            _, seq, alarm_id = heap[0]
+            alarm = self._alarms.get(alarm_id)
+            if alarm is not None and alarm._seq == seq:
+                return
+            heapq.heappop(heap)
+
+    def add(self, hour, minute, now_ts, tz_name=None, alarm_id=None, fire_ts=None, rule=None, date=None):
+        """
+        Adds an alarm and returns its id. Raises ValueError for an invalid time.
+        A known fire_ts (e.g. restored from the journal) skips the zone lookup.
+        A dated alarm fires at that date's HH:MM even if it is already past.
+        """
+        datetime.time(hour, minute)  # Validates the range
+        if alarm_id is None:
+            alarm_id = next(self._ids)
+            while alarm_id in self._alarms:
+                alarm_id = next(self._ids)
+        else:
+            self.remove(alarm_id)
+        alarm = Alarm(alarm_id, hour, minute, tz_name, rule, date)
+        if fire_ts is None:
+            fire_ts = self._next_fire_ts(alarm, now_ts)  # May raise; nothing is added then
+        self._alarms[alarm.alarm_id] = alarm
+        self._push(alarm, now_ts, fire_ts)
+        return alarm.alarm_id
+
+    def add_many(self, entries, now_ts):
+        """
+        Adds (hour, minute, tz_name, date) entries in one go and returns their
+        ids (date None: the next HH:MM).
+        A batch that is large next to the heap is appended and re-heapified
+        (O(n)) instead of being pushed one entry at a time (O(k log n)).
+        """
+        added = []
+        for hour, minute, tz_name, date in entries:
+            datetime.time(hour, minute)  # Validates the range
+            alarm_id = next(self._ids)
+            while alarm_id in self._alarms:
+                alarm_id = next(self._ids)
+            alarm = Alarm(alarm_id, hour, minute, tz_name, date=date)
+            alarm.fire_ts = self._next_fire_ts(alarm, now_ts)
+            alarm._seq = next(self._seq)
+            added.append(alarm)
+
+        heap = self._heap
+        if len(added) > len(heap) // 4:
+            heap.extend((alarm.fire_ts, alarm._seq, alarm.alarm_id) for alarm in added)
+            heapq.heapify(heap)
+        else:
+            for alarm in added:
+                heapq.heappush(heap, (alarm.fire_ts, alarm._seq, alarm.alarm_id))
+        for alarm in added:
+            self._alarms[alarm.alarm_id] = alarm
+        return [alarm.alarm_id for alarm in added]
+
+    def remove(self, alarm_id):
+        """Removes an alarm. Returns False if the id is unknown."""
+        if self._alarms.pop(alarm_id, None) is None:
+            return False
+        # Stale entries normally drain at the head; rebuild if removals pile them up.
+        if len(self._heap) > 2 * len(self._alarms) + 64:
+            self._heap = [entry for entry in self._heap
+                          if entry[2] in self._alarms and self._alarms[entry[2]]._seq == entry[1]]
+            heapq.heapify(self._heap)
+        return True
+
+    def get(self, alarm_id):
+        return self._alarms.get(alarm_id)
+
+    def list(self):
+        """Returns all alarms ordered by their next fire instant."""
+        return sorted(self._alarms.values(), key=lambda a: (a.fire_ts, a.alarm_id))
+
+    def clear(self):
+        self._heap.clear()
+        self._alarms.clear()
+
+    def peek_fire_ts(self):
+        """Returns the timestamp of the earliest pending alarm, or None."""
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_ts):
+        """
+        Returns every alarm whose fire instant is at or before now_ts. One-shot
+        alarms are removed; repeating ones are rescheduled (their fire_ts is then
+        the next occurrence) and fire once however many occurrences were missed.
+        """
+        fired = []
+        repeating = []
+        while True:
+            self._drop_stale_head()
+            if not self._heap or self._heap[0][0] > now_ts:
+                break
+            _, _, alarm_id = heapq.heappop(self._heap)
+            alarm = self._alarms[alarm_id]
+            fired.append(alarm)
+            if alarm.rule is None:
+                del self._alarms[alarm_id]
+            else:
+                repeating.append(alarm)
+        for alarm in repeating:
+            # Past the minute that just fired, so it cannot count as still in progress
+            next_now = max(alarm.fire_ts + 60, now_ts)
+            self._push(alarm, next_now, self._next_fire_ts(alarm, next_now, alarm.fire_ts))
+        return fired
+
+    def set_display_timezone(self, tz_name, now_ts):
+        """Re-targets alarms that follow the displayed timezone and rebuilds the heap."""
+        self._display_tz_name = tz_name
+        self._heap = []
+        for alarm in self._alarms.values():
+            if alarm.tz_name is None:
+                alarm.fire_ts = self._next_fire_ts(alarm, now_ts)
+            alarm._seq = next(self._seq)
+            self._heap.append((alarm.fire_ts, alarm._seq, alarm.alarm_id))
+        heapq.heapify(self._heap)
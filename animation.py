@@ -0,0 +1,105 @@
+# animation.py
+import math
+import time
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+class Tween:
+    """
+    Moves a value from start to end over 'duration' seconds, passing it to
+    on_value() every frame. The value depends only on the elapsed time, so a
+    late frame jumps ahead instead of slowing the animation down.
+    """
+
+    def __init__(self, start, end, duration, on_value, easing=None):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.on_value = on_value
+        self.easing = easing
+        self.value = start
+        self._started_at = None
+
+    def step(self, now):
+        """Applies the value for 'now'; returns when the next frame is wanted (None when done)."""
+        if self._started_at is None:
+            self._started_at = now
+        t = 1.0 if self.duration <= 0 else min((now - self._started_at) / self.duration, 1.0)
+        if self.easing is not None:
+            t = self.easing(t)
+        self.value = self.start + (self.end - self.start) * t
+        self.on_value(self.value)
+        return now if t < 1.0 else None
+
+
+class AnimationScheduler:
+    """
+    Drives any number of animations from a single Tk after() callback per frame.
+
+    An animation is any object with step(now) -> next wanted time or None
+    (finished). Frames run at most every 1/fps seconds, and only as often as
+    the animations ask for. When a frame comes late (the Tk thread was busy),
+    the missed frames are counted and skipped; time-based animations just
+    catch up.
+    """
+
+    def __init__(self, widget, fps=60, clock=time.monotonic):
+        self.widget = widget
+        self.frame_interval = 1.0 / fps
+        self._clock = clock
+        self._animations = {}
+        self._after_id = None
+        self._frame_due = None
+
+        # --- Counters ---
+        self.frames = 0
+        self.dropped = 0
+
+    def add(self, name, animation):
+        """Starts an animation, replacing the one running under the same name."""
+        self._animations[name] = animation
+        # Run the next frame now rather than whenever the current animations wanted one
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._frame_due = None
+        self._after_id = self.widget.after(0, self._frame)
+
+    def remove(self, name):
+        self._animations.pop(name, None)
+
+    def is_running(self, name):
+        return name in self._animations
+
+    def stop(self):
+        """Cancels the pending frame and forgets every animation."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._animations.clear()
+
+    def _frame(self):
+        self._after_id = None
+        now = self._clock()
+        if self._frame_due is not None and now - self._frame_due >= self.frame_interval:
+            self.dropped += int((now - self._frame_due) / self.frame_interval)
+        self.frames += 1
+
+        wanted = None
+        for name, animation in list(self._animations.items()):
+            due = animation.step(now)
+            if due is None:
+                if self._animations.get(name) is animation:
+                    del self._animations[name]
+            elif wanted is None or due < wanted:
+                wanted = due
+
+        if wanted is None:
+            self._frame_due = None
+            return
+        # Never more often than the frame budget allows
+        self._frame_due = max(wanted, now + self.frame_interval)
+        delay_ms = max(math.ceil((self._frame_due - self._clock()) * 1000), 1)
+        self._after_id = self.widget.after(delay_ms, self._frame)
@@ -0,0 +1,236 @@
+# async_runtime.py
+# Drives ClockController from an asyncio event loop instead of Tk's after().
+#
+#   Tk:        runtime = AsyncClockRuntime(controller, TkBridge(view)); runtime.start(); view.mainloop()
+#   Headless:  AsyncClockRuntime(controller).run()
+#
+# With a Tk view the loop runs on a worker thread. Every model/view call is
+# posted to the Tk thread through TkBridge (a virtual event; Tk wakes up for it
+# like for any other event), and Tk-side code reaches the loop through
+# loop.call_soon_threadsafe() / submit(). Neither side ever polls. Other
+# coroutines (sockets, files, notification sinks) can share the loop via
+# submit() and touch the model through call_in_ui().
+import asyncio
+import collections
+import sys
+import threading
+import time
+
+from scheduler import MIN_SLEEP, clamp_sleep
+
+# How soon to post again while Tk is not dispatching events (e.g. before mainloop())
+POST_RETRY = 0.05
+
+
+class TkBridge:
+    """
+    Runs callables on the Tk thread. post() may be called from any thread: it
+    queues the callable and generates a virtual event, whose handler drains
+    the queue inside Tk's own event loop.
+    """
+
+    EVENT = "<<ClockRuntimeWake>>"
+
+    def __init__(self, widget):
+        # Imported here so the headless runtime never loads tkinter
+        from tkinter import TclError
+
+        self.widget = widget
+        self._tcl_error = TclError
+        self._calls = collections.deque()
+        widget.bind(self.EVENT, self._drain, add="+")
+
+    def post(self, func):
+        """
+        Queues func for the Tk thread. Returns False, with func not queued, if Tk
+        is not running its main loop; raises TclError once the widget is gone.
+        """
+        self._calls.append(func)
+        try:
+            self.widget.event_generate(self.EVENT, when="tail")
+        except (RuntimeError, self._tcl_error):
+            try:
+                self._calls.remove(func)
+            except ValueError:
+                return True  # An earlier event's drain has run it already
+            if sys.exc_info()[0] is RuntimeError:
+                return False
+            raise
+        return True
+
+    def _drain(self, event=None):
+        # One event may find several calls queued (or none, if an earlier event took them)
+        calls = self._calls
+        while calls:
+            calls.popleft()()
+
+
+class AsyncClockRuntime:
+    """
+    Ticks, alarm deadlines and timer expiries as asyncio tasks:
+      * the tick task runs controller ticks on the TickScheduler's second grid
+        (only when there is a visible view to keep current);
+      * the deadline task sleeps until the next alarm or timer is due and runs
+        a tick right then if that is sooner than the next regular tick.
+    Call wake() after changing alarms or timers (or queueing controller
+    commands) so the deadline is recomputed.
+    """
+
+    def __init__(self, controller, bridge=None):
+        self.controller = controller
+        self.bridge = bridge
+        self.loop = None
+        self._thread = None
+        self._tasks = []
+        self._rearm = None
+        self._next_tick_at = None
+        self.ticks = 0
+        self.deadline_wakeups = 0
+
+    # --- Running ---
+
+    def run(self):
+        """Runs the loop in the calling thread until stop() (headless use)."""
+        asyncio.run(self._main())
+
+    def start(self):
+        """Runs the loop on a daemon thread (Tk use); returns immediately."""
+        if self._thread is None:
+            ready = threading.Event()
+            self._thread = threading.Thread(target=asyncio.run, args=(self._main(ready),),
+                                            name="clock-runtime", daemon=True)
+            self._thread.start()
+            ready.wait()
+            if self.bridge is not None:
+                self.bridge.widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def stop(self, timeout=1.0):
+        """Cancels the runtime's tasks and ends the loop. Safe to call from any thread."""
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel_tasks)
+            except RuntimeError:
+                pass  # The loop closed in the meantime
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Makes the deadline task re-read the next alarm/timer. Safe to call from any thread."""
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._rearm.set)
+
+    def submit(self, coro):
+        """Schedules a coroutine on the runtime's loop from any thread; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_in_ui(self, func, *args):
+        """Runs func(*args) on the UI thread (or inline when headless). Await the result on the loop."""
+        future = self.loop.create_future()
+        if self.bridge is None:
+            self._settle(future, func, args)
+        else:
+            self._post(future, func, args)
+        return future
+
+    # --- Internals ---
+
+    async def _main(self, ready=None):
+        self.loop = asyncio.get_running_loop()
+        self._rearm = asyncio.Event()
+        if self.bridge is not None:
+            self._tasks.append(asyncio.create_task(self._tick_task()))
+        self._tasks.append(asyncio.create_task(self._deadline_task()))
+        if ready is not None:
+            ready.set()
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
+
+    def _cancel_tasks(self):
+        for task in self._tasks:
+            task.cancel()
+
+    def _on_destroy(self, event):
+        # <Destroy> also fires for every child widget; only the window itself counts
+        if event.widget is self.bridge.widget:
+            self.stop(timeout=0)
+
+    def _post(self, future, func, args):
+        if future.cancelled():
+            return
+        try:
+            posted = self.bridge.post(lambda: self._run_posted(future, func, args))
+        except Exception as e:  # The widget was destroyed
+            self._resolve(future, None, e)
+            return
+        if not posted:
+            # Tk is not dispatching events yet (or is blocked outside mainloop()); try again shortly
+            self.loop.call_later(POST_RETRY, self._post, future, func, args)
+
+    def _run_posted(self, future, func, args):
+        # Runs on the UI thread; hands the outcome back to the loop thread
+        try:
+            result, error = func(*args), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            self.loop.call_soon_threadsafe(self._resolve, future, result, error)
+        except RuntimeError:
+            pass  # The loop closed in the meantime
+
+    def _settle(self, future, func, args):
+        try:
+            self._resolve(future, func(*args), None)
+        except Exception as e:
+            self._resolve(future, None, e)
+
+    @staticmethod
+    def _resolve(future, result, error):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _ui_tick(self):
+        # One scheduled tick, run on the UI thread (same steps as update_clock)
+        controller = self.controller
+        controller.scheduler.tick_started()
+        controller.process_tick()
+        return time.monotonic() + controller.scheduler.next_delay_ms() / 1000
+
+    async def _tick_task(self):
+        loop = self.loop
+        while True:
+            # loop.time() is time.monotonic(), the clock the TickScheduler aims with
+            self._next_tick_at = await self.call_in_ui(self._ui_tick)
+            self.ticks += 1
+            self._rearm.set()
+            await asyncio.sleep(max(self._next_tick_at - loop.time(), 0))
+
+    async def _deadline_task(self):
+        loop = self.loop
+        if self.bridge is None:
+            # Headless: apply anything queued before the loop was running
+            await self.call_in_ui(self.controller.process_tick)
+        while True:
+            self._rearm.clear()
+            wake_in = await self.call_in_ui(self.controller.get_next_wakeup)
+            try:
+                await asyncio.wait_for(self._rearm.wait(), clamp_sleep(wake_in))
+                if self.bridge is None:
+                    # Headless: nothing else ticks, so apply whatever woke us (e.g. queued commands)
+                    await self.call_in_ui(self.controller.process_tick)
+                continue  # Something changed (or a tick ran): recompute the deadline
+            except asyncio.TimeoutError:
+                pass
+
+            if self._next_tick_at is not None and self._next_tick_at <= loop.time() + MIN_SLEEP:
+                continue  # The regular tick is due anyway
+            self.deadline_wakeups += 1
+            await self.call_in_ui(self.controller.process_tick)
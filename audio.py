@@ -0,0 +1,176 @@
+# audio.py
+import atexit
+import io
+import math
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+
+
+# --- Backends ---
+# A backend only needs play(frequency, duration_ms), which may block: it always
+# runs on the AudioWorker thread, never on the Tk thread.
+
+class NullBackend:
+    """Plays nothing; remembers what it was asked to play (useful in tests)."""
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, frequency, duration_ms):
+        self.played.append((frequency, duration_ms))
+
+
+class WinsoundBackend:
+    """The original Windows beep."""
+
+    def __init__(self):
+        import winsound  # Windows only; imported here so other platforms can load this module
+        self._winsound = winsound
+
+    def play(self, frequency, duration_ms):
+        self._winsound.Beep(frequency, duration_ms)
+
+
+class WavBackend:
+    """
+    Synthesises a sine tone as 16-bit PCM WAV with the standard library and hands
+    it to the first available command-line player (no shell involved). Falls
+    back to the terminal bell when no player is installed.
+    """
+
+    SAMPLE_RATE = 22050
+    PLAYERS = (["aplay", "-q"], ["paplay"], ["afplay"])
+
+    def __init__(self, volume=0.5):
+        self.volume = volume
+        self._player = next((cmd for cmd in self.PLAYERS if shutil.which(cmd[0])), None)
+        self._files = {}  # (frequency, duration_ms) -> path of the rendered tone
+        atexit.register(self.close)
+
+    @classmethod
+    def render(cls, frequency, duration_ms, volume=0.5):
+        """Returns the bytes of a mono WAV file containing the tone."""
+        frames = int(cls.SAMPLE_RATE * duration_ms / 1000)
+        amplitude = int(32767 * volume)
+        step = 2 * math.pi * frequency / cls.SAMPLE_RATE
+        samples = struct.pack(f"<{frames}h", *(int(amplitude * math.sin(step * i)) for i in range(frames)))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(cls.SAMPLE_RATE)
+            wav.writeframes(samples)
+        return buffer.getvalue()
+
+    def _file_for(self, frequency, duration_ms):
+        key = (frequency, duration_ms)
+        if key not in self._files:
+            fd, path = tempfile.mkstemp(prefix="clock_tone_", suffix=".wav")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.render(frequency, duration_ms, self.volume))
+            self._files[key] = path
+        return self._files[key]
+
+    def close(self):
+        """Deletes the rendered tone files (also run at exit)."""
+        for path in self._files.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._files.clear()
+
+    def play(self, frequency, duration_ms):
+        if self._player is None:
+            sys.stdout.write("\a")
+            sys.stdout.flush()
+            return
+        path = self._file_for(frequency, duration_ms)
+        subprocess.run(self._player + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def default_backend():
+    """Returns the best backend for this platform."""
+    if sys.platform == "win32":
+        try:
+            return WinsoundBackend()
+        except ImportError:
+            pass
+    return WavBackend()
+
+
+# --- Worker ---
+
+class AudioWorker:
+    """
+    Plays notification sounds on a dedicated daemon thread. trigger() is just a
+    queue put, so the tick loop never waits on audio. Requests that arrive while
+    a sound is playing are merged: once it finishes, each distinct pending
+    sound is played only once.
+    """
+
+    def __init__(self, backend=None, max_pending=16):
+        self.backend = backend if backend is not None else default_backend()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+        # --- Counters ---
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audio-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Asks the worker to exit after the current sound and waits for it."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def trigger(self, frequency=1000, duration_ms=1000):
+        """Queues a sound. Never blocks; drops the request if the queue is full."""
+        self.start()
+        try:
+            self._queue.put_nowait((frequency, duration_ms))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            sound = self._queue.get()
+            if sound is None:
+                return
+
+            # Merge everything that queued up behind this sound
+            pending = [sound]
+            try:
+                while True:
+                    extra = self._queue.get_nowait()
+                    if extra is None:
+                        self._queue.put(None)  # Honour stop() after this batch
+                        break
+                    if extra in pending:
+                        self.merged += 1
+                    else:
+                        pending.append(extra)
+            except queue.Empty:
+                pass
+
+            for frequency, duration_ms in pending:
+                try:
+                    self.backend.play(frequency, duration_ms)
+                    self.played += 1
+                except Exception as e:
+                    print(f"Audio error: {e}")
@@ -0,0 +1,349 @@
+# benchmarks.py
+# Micro-benchmarks for the clock engine. Run all of them with
+#     python benchmarks.py
+# or a single one with e.g.
+#     python benchmarks.py timing_wheel
+import random
+import sys
+import time
+
+
+def _per_call_us(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+# --- Timing Wheel ---
+
+def bench_timing_wheel():
+    """Per-tick cost of MultiTimer with 10 .. 100k running timers: amortized O(1), with cascade spikes (mean, p99, max)."""
+    from timing_wheel import SLOTS, MultiTimer
+
+    # Most ticks touch one slot, but every SLOTS ticks a slot of the next level
+    # is cascaded down, and at tick SLOTS**2 a whole level-2 slot: the largest
+    # spike, so the run goes past it and the max is shown next to the mean.
+
+    print("timers     mean (us)    p99 (us)     max (us)   expired/tick")
+    for count in (10, 100, 1_000, 10_000, 100_000):
+        now = [0.0]
+        timers = MultiTimer(resolution=0.1, clock=lambda: now[0])
+        rng = random.Random(count)
+        for _ in range(count):
+            timers.start(timers.create(rng.uniform(1, 3600)))
+
+        ticks = SLOTS ** 2 + 1_000  # Past the first level-2 cascade
+        expired = 0
+        costs = []
+        for _ in range(ticks):
+            now[0] += 0.1
+            start = time.perf_counter()
+            expired += len(timers.tick())
+            costs.append((time.perf_counter() - start) * 1e6)
+        costs.sort()
+        mean = sum(costs) / ticks
+        print(f"{count:>7,}   {mean:>10.2f}   {costs[int(ticks * 0.99)]:>9.2f}   {costs[-1]:>10.1f}"
+              f"   {expired / ticks:>12.2f}")
+
+
+# --- Per-Tick Time Snapshot ---
+
+def bench_tick_snapshot():
+    """Per-tick cost of the time/date strings: old per-getter lookups vs one snapshot."""
+    import datetime
+    import pytz
+    from models import ClockModel
+
+    zone = "America/New_York"
+
+    def old_tick():
+        # What get_time_string + get_date_string used to do on every tick
+        now = datetime.datetime.now(pytz.timezone(zone))
+        now.strftime("%H:%M:%S")
+        now = datetime.datetime.now(pytz.timezone(zone))
+        now.strftime("%a, %b %d, %Y")
+
+    model = ClockModel()
+    model.set_timezone("EST (New York)")
+
+    def new_tick():
+        model.update_now()
+        model.get_time_string()
+        model.get_date_string()
+
+    old_us = _per_call_us(old_tick, 20_000)
+    new_us = _per_call_us(new_tick, 20_000)
+    print(f"per-getter lookups: {old_us:8.2f} us/tick")
+    print(f"single snapshot:    {new_us:8.2f} us/tick  ({old_us / new_us:.1f}x faster)")
+
+
+# --- Model -> View Snapshot ---
+
+def bench_snapshot():
+    """Per-tick latency and allocations: seven getters + dict vs one ClockSnapshot."""
+    import tracemalloc
+    from models import ClockModel
+
+    model = ClockModel()
+
+    def dict_tick():
+        model.update_now()
+        return {
+            "time_str": model.get_time_string(),
+            "date_str": model.get_date_string(),
+            "format_status": model.get_format_status(),
+            "alarm_status": model.get_alarm_status(),
+            "timer_str": model.get_timer_string(),
+            "timer_status": model.get_timer_status(),
+            "tz_key": model.get_selected_timezone_key(),
+        }
+
+    def snapshot_tick():
+        return model.snapshot()
+
+    for name, tick in (("dict", dict_tick), ("snapshot", snapshot_tick)):
+        latency = _per_call_us(tick, 20_000)
+        tracemalloc.start()
+        kept = [tick() for _ in range(1_000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name:<9} {latency:8.2f} us/tick   {size / len(kept):8.0f} bytes retained/tick")
+
+
+# --- Formatting Tables ---
+
+def bench_formatting():
+    """strftime / f-string formatting vs precomputed table lookups."""
+    import datetime
+    from formatting import format_clock, format_duration, get_table
+
+    start = time.perf_counter()
+    get_table("24"), get_table("12"), get_table("mmss")
+    print(f"table build (one-off):  {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    now = datetime.datetime.now()
+    cases = (
+        ("strftime %H:%M:%S", lambda: now.strftime("%H:%M:%S")),
+        ("table 24-hour", lambda: format_clock(now.hour, now.minute, now.second)),
+        ("strftime %I:%M:%S %p", lambda: now.strftime("%I:%M:%S %p")),
+        ("table 12-hour", lambda: format_clock(now.hour, now.minute, now.second, False)),
+        ("divmod + f-string timer", lambda: _old_timer_string(12345)),
+        ("table timer", lambda: format_duration(12345)),
+    )
+    for name, func in cases:
+        print(f"{name:<24}{_per_call_us(func, 200_000):8.3f} us")
+
+
+def _old_timer_string(seconds):
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    seconds = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+# --- Journal Restore ---
+
+def bench_journal_restore():
+    """Startup restore time after a long history of alarm/timer changes, with and without compaction."""
+    import tempfile
+    from journal import Journal
+    from models import ClockModel
+
+    print("changes    compact_after   journal lines   restore (ms)")
+    for changes in (10_000, 100_000):
+        for compact_after in (1_000, changes * 2):
+            with tempfile.TemporaryDirectory() as directory:
+                model = ClockModel()
+                model.attach_journal(Journal(directory, compact_after=compact_after))
+                rng = random.Random(changes)
+                alarm_ids = []
+                for _ in range(changes // 2):
+                    alarm_ids.append(model.add_alarm(rng.randrange(24), rng.randrange(60)))
+                    if len(alarm_ids) > 500:
+                        model.remove_alarm(alarm_ids.pop(rng.randrange(len(alarm_ids))))
+                lines = model._journal._records
+                model.close_journal()
+
+                start = time.perf_counter()
+                ClockModel().attach_journal(Journal(directory, compact_after=compact_after))
+                restore_ms = (time.perf_counter() - start) * 1000
+            print(f"{changes:>7,}   {compact_after:>13,}   {lines:>13,}   {restore_ms:>12.1f}")
+
+
+# --- Splash Image Cache ---
+
+def bench_splash_image():
+    """Splash image preparation: PIL decode + LANCZOS resize on every launch vs the PNG cache."""
+    import tempfile
+    import image_cache
+
+    size = (400, 240)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        image_cache.get_resized_path("DGIF.gif", size, directory)
+        cold_ms = (time.perf_counter() - start) * 1000
+        warm_ms = _per_call_us(lambda: image_cache.get_resized_path("DGIF.gif", size, directory), 1_000) / 1000
+    print(f"decode + resize (cold): {cold_ms:8.2f} ms")
+    print(f"cache hit (warm):       {warm_ms:8.3f} ms")
+
+
+# --- One vs Two Tk Interpreters ---
+
+# Builds the clock window either on its own tk.Tk next to the (splash) root, as
+# before, or inside that root. Prints seconds and peak RSS (KiB on Linux).
+_TK_STARTUP_SCRIPT = """
+import resource, sys, time
+start = time.perf_counter()
+import tkinter as tk
+from models import ClockModel
+from controller import ClockController
+from view import ClockView
+root = tk.Tk()
+root.withdraw()
+controller = ClockController(ClockModel())
+view = ClockView(controller, master=None if sys.argv[1] == "two" else root)
+controller.set_view(view)
+controller.refresh_view()
+view.update()
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def bench_tk_startup():
+    """Window startup time and peak RSS: splash root + second tk.Tk vs one shared interpreter (needs a display)."""
+    import statistics
+    import subprocess
+
+    runs = 5
+    print("interpreters   startup (ms)   peak RSS (KiB)")
+    for mode in ("two", "one"):
+        times, peaks = [], []
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, "-c", _TK_STARTUP_SCRIPT, mode],
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"skipped: {result.stderr.strip().splitlines()[-1]}")
+                return
+            seconds, peak = result.stdout.split()
+            times.append(float(seconds) * 1000)
+            peaks.append(int(peak))
+        print(f"{mode:>12}   {statistics.median(times):>12.1f}   {statistics.median(peaks):>14,}")
+
+
+# --- Bulk Alarm Import ---
+
+def _write_schedule(path, rows, ics):
+    import datetime
+
+    rng = random.Random(rows)
+    year = datetime.date.today().year + 1  # Dated rows in the past would be rejected
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if ics:
+            f.write("BEGIN:VCALENDAR\r\n")
+            for day in range(rows):
+                f.write(f"BEGIN:VEVENT\r\nSUMMARY:Shift {day}\r\n"
+                        f"DTSTART;TZID=Europe/Berlin:{year}{1 + day % 12:02d}01T{rng.randrange(24):02d}{rng.randrange(60):02d}00\r\n"
+                        "END:VEVENT\r\n")
+            f.write("END:VCALENDAR\r\n")
+        else:
+            f.write("date,start,timezone\r\n")
+            for day in range(rows):
+                f.write(f"{year}-{1 + day % 12:02d}-01,{rng.randrange(24):02d}:{rng.randrange(60):02d},\r\n")
+
+
+def bench_alarm_import():
+    """CSV/ICS import throughput in rows/s (add_alarm per row vs the streamed bulk import) and pipeline peak memory."""
+    import os
+    import tempfile
+    import tracemalloc
+    import alarm_import
+    from journal import Journal
+    from models import ClockModel
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("format      rows   per-row add (rows/s)   bulk import (rows/s)")
+        for ics in (False, True):
+            rows = 20_000
+            path = os.path.join(directory, "schedule.ics" if ics else "schedule.csv")
+            _write_schedule(path, rows, ics)
+
+            model = ClockModel()
+            model.attach_journal(Journal(os.path.join(directory, "row"), compact_after=1_000))
+            start = time.perf_counter()
+            report = alarm_import.ImportReport()
+            for hour, minute, tz_name, date in alarm_import.valid_alarms(alarm_import.rows_for(path), report):
+                model.add_alarm(hour, minute, tz_name, date=date)
+            per_row = rows / (time.perf_counter() - start)
+            model.close_journal()
+
+            model = ClockModel()
+            model.attach_journal(Journal(os.path.join(directory, "bulk"), compact_after=1_000))
+            start = time.perf_counter()
+            alarm_import.import_alarms(model, path)
+            bulk = rows / (time.perf_counter() - start)
+            model.close_journal()
+            print(f"{'ics' if ics else 'csv':>6}   {rows:>7,}   {per_row:>20,.0f}   {bulk:>20,.0f}")
+
+        # Read + validate only (no alarm store), so what is measured is the pipeline itself
+        print("rows         pipeline peak (KiB)")
+        for rows in (10_000, 100_000, 1_000_000):
+            path = os.path.join(directory, f"big{rows}.csv")
+            _write_schedule(path, rows, ics=False)
+            tracemalloc.start()
+            for batch in alarm_import.batches(alarm_import.valid_alarms(alarm_import.rows_for(path),
+                                                                        alarm_import.ImportReport())):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{rows:>9,}   {peak / 1024:>19,.1f}")
+
+
+# --- Recurrence Rules ---
+
+def bench_recurrence():
+    """Next-occurrence cost per rule kind (µs/call, independent of how far away it is) and re-queueing fired repeats."""
+    from alarms import AlarmQueue, next_fire_timestamp
+    from recurrence import parse_rule
+
+    now_ts = time.time()
+    print("rule                              next occurrence (µs)")
+    print(f"{'one-shot (next_fire_timestamp)':<32}   {_per_call_us(lambda: next_fire_timestamp(7, 30, 'Europe/Berlin', now_ts), 20_000):>8.2f}")
+    for text in ("daily", "weekdays", "sun", "every 3 days", "every 400 days"):
+        rule = parse_rule(text)
+        us = _per_call_us(lambda: rule.next_fire_ts(7, 30, "Europe/Berlin", now_ts), 20_000)
+        print(f"{text:<32}   {us:>8.2f}")
+
+    rng = random.Random(1)
+    queue = AlarmQueue()
+    rules = [parse_rule(text) for text in ("daily", "weekdays", "weekends", "mon,thu", "every 2 days")]
+    for _ in range(10_000):
+        queue.add(rng.randrange(24), rng.randrange(60), now_ts, "Europe/Berlin", rule=rng.choice(rules))
+    start = time.perf_counter()
+    fired = 0
+    for _ in range(7 * 1440):  # One simulated week, a check per minute
+        now_ts += 60
+        fired += len(queue.pop_due(now_ts))
+    elapsed = time.perf_counter() - start
+    print(f"10,000 repeating alarms, one week: {fired:,} firings, {elapsed * 1e6 / max(fired, 1):.1f} µs per firing")
+
+
+BENCHMARKS = {
+    "timing_wheel": bench_timing_wheel,
+    "tick_snapshot": bench_tick_snapshot,
+    "snapshot": bench_snapshot,
+    "formatting": bench_formatting,
+    "journal_restore": bench_journal_restore,
+    "splash_image": bench_splash_image,
+    "tk_startup": bench_tk_startup,
+    "alarm_import": bench_alarm_import,
+    "recurrence": bench_recurrence,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,226 @@
+# control_api.py
+# Local HTTP/JSON API for scripting alarms and timers in bulk. Listens on
+# 127.0.0.1 only. Every command is validated on the request thread and queued
+# for the ClockController, which applies a capped number per tick, so a flood
+# of requests can slow the API down but never the UI.
+#
+#   POST /v1/commands  {"commands": [{"cmd": "alarm", "time": "07:30"}, ...]}
+#   POST /v1/alarms    {"alarms": ["07:30", "08:15", ...]}
+#   POST /v1/timers    {"timers": ["00:05:00", ...]}          (extra timers)
+#   GET  /v1/health    -> {"ok": true, "pending": <queued commands>}
+#
+# A batch answers with one {"ok": ..., "result"/"error": ...} per command, in
+# order, once all of them have been applied (result: the new alarm/timer id).
+#
+# Listening on loopback is not enough on its own: any local process, and any
+# web page through the browser (DNS rebinding), can reach the port. So every
+# request must carry
+#
+#   Authorization: Bearer <token>   (the token is in <state dir>/control_api.token,
+#                                    readable by this user only)
+#   Host: 127.0.0.1:<port> or localhost:<port>
+#
+# and a POST must be sent as Content-Type: application/json, which a page
+# cannot send to another origin without a preflight we never answer.
+import hmac
+import json
+import os
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from journal import default_directory
+from validation import InputError, parse_command
+
+DEFAULT_PORT = 8765
+MAX_BATCH = 1000        # Commands per request
+MAX_BODY = 1 << 20      # Bytes per request
+APPLY_TIMEOUT = 30.0    # Seconds a request waits for its commands to be applied
+TOKEN_NAME = "control_api.token"
+
+
+def load_token(directory):
+    """Returns the API token stored in 'directory', creating it (mode 0600) on first use."""
+    path = os.path.join(directory, TOKEN_NAME)
+    os.makedirs(directory, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "r", encoding="utf-8") as f:
+            token = f.read().strip()
+        if token:
+            return token
+        # An empty file left by a crash during creation
+        os.unlink(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    token = secrets.token_urlsafe(32)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token + "\n")
+    return token
+
+
+class _Batch:
+    """Collects the results of one request's commands as the controller applies them."""
+
+    def __init__(self, size):
+        self.results = [None] * size
+        self._pending = size
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+        if size == 0:
+            self.done.set()
+
+    def on_done_for(self, index):
+        def on_done(result, error):
+            self.results[index] = {"ok": True, "result": result} if error is None else {"ok": False, "error": error}
+            with self._lock:
+                self._pending -= 1
+                if self._pending == 0:
+                    self.done.set()
+        return on_done
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "TimeUtility/1"
+
+    def log_message(self, format, *args):
+        pass  # No per-request logging on the console
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _allowed(self):
+        """Checks the Host and Authorization headers; replies with the error and returns False if either is wrong."""
+        port = self.server.server_address[1]
+        host = (self.headers.get("Host") or "").strip().lower()
+        if host not in (f"127.0.0.1:{port}", f"localhost:{port}"):
+            self._reply(403, {"ok": False, "error": "Unexpected Host header."})
+            return False
+        expected = f"Bearer {self.server.token}".encode("utf-8")
+        given = (self.headers.get("Authorization") or "").strip().encode("utf-8")
+        if not hmac.compare_digest(given, expected):
+            self._reply(401, {"ok": False, "error": f"Missing or wrong API token (see {TOKEN_NAME})."})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._allowed():
+            return
+        if self.path == "/v1/health":
+            self._reply(200, {"ok": True, "pending": self.server.commands.qsize()})
+        else:
+            self._reply(404, {"ok": False, "error": "Not found."})
+
+    def do_POST(self):
+        if not self._allowed():
+            return
+        # Each endpoint names the body key holding the list and how to turn one item into a command
+        endpoints = {
+            "/v1/commands": ("commands", lambda item: item),
+            "/v1/alarms": ("alarms", lambda item: {"cmd": "alarm", "time": item}),
+            "/v1/timers": ("timers", lambda item: {"cmd": "add_timer", "duration": item}),
+        }
+        if self.path not in endpoints:
+            self._reply(404, {"ok": False, "error": "Not found."})
+            return
+        key, to_message = endpoints[self.path]
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self._reply(415, {"ok": False, "error": "Send the body as Content-Type: application/json."})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._reply(400, {"ok": False, "error": "Invalid Content-Length header."})
+            return
+        if length > MAX_BODY:
+            self._reply(413, {"ok": False, "error": f"Request body over {MAX_BODY} bytes."})
+            return
+        try:
+            items = json.loads(self.rfile.read(length) or b"{}").get(key)
+        except (ValueError, AttributeError):
+            items = None
+        if not isinstance(items, list):
+            self._reply(400, {"ok": False, "error": f"Expected a JSON object with a '{key}' list."})
+            return
+        if len(items) > MAX_BATCH:
+            self._reply(413, {"ok": False, "error": f"At most {MAX_BATCH} commands per request."})
+            return
+
+        # Validate everything first; only valid commands are queued
+        commands = []
+        results = []
+        for item in items:
+            try:
+                commands.append(parse_command(to_message(item)))
+                results.append(None)
+            except (InputError, ValueError) as e:
+                # A ValueError is a number int() rejects after a looser check; never drop the connection over it
+                results.append({"ok": False, "error": getattr(e, "message", str(e))})
+
+        batch = _Batch(len(commands))
+        valid = [i for i, result in enumerate(results) if result is None]
+        for index, command in enumerate(commands):
+            self.server.commands.put((command, batch.on_done_for(index)))
+        if self.server.on_command is not None and commands:
+            self.server.on_command()
+
+        if not batch.done.wait(APPLY_TIMEOUT):
+            self._reply(202, {"ok": True, "queued": len(commands),
+                              "error": "Commands are queued but were not applied in time."})
+            return
+        for i, result in zip(valid, batch.results):
+            results[i] = result
+        self._reply(200, {"ok": all(result["ok"] for result in results), "results": results})
+
+
+class ControlServer:
+    """
+    Serves the API on a background thread. 'commands' is the
+    ClockController's queue; on_command, if given, is called after each batch
+    is queued (e.g. HeadlessRuntime.wake). The token is kept in 'directory'
+    (the clock's state directory by default).
+    """
+
+    def __init__(self, commands, port=DEFAULT_PORT, on_command=None, directory=None):
+        self.commands = commands
+        self.port = port
+        self.on_command = on_command
+        self.token_path = os.path.join(directory or default_directory(), TOKEN_NAME)
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Starts listening. Returns False if the port or the token file is unavailable."""
+        try:
+            token = load_token(os.path.dirname(self.token_path))
+        except OSError as e:
+            print(f"Control API: could not read or create {self.token_path}: {e}")
+            return False
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _Handler)
+        except OSError as e:
+            print(f"Control API: could not listen on port {self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self._server.commands = self.commands
+        self._server.on_command = self.on_command
+        self._server.token = token
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="control-api", daemon=True)
+        self._thread.start()
+        return True
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -162,42 +162,143 @@
 
 
 # controller.py
-import os
-from tkinter import messagebox
-import winsound # Using the built-in Windows sound module
+# Nothing here imports tkinter: the controller only talks to its view through
+#   update_displays(snapshot), is_frame_visible(name), show_error(title, message),
+#   show_info(title, message), notify(fired_alarms, finished_timer_ids, timer_finished)
+#   focus_window()
+# plus after()/after_cancel() and the entry frames for the Tk-driven methods.
+# ClockView (view.py) and ConsoleView (headless.py) both implement it.
+import math
+import queue
+from audio import AudioWorker
+from recurrence import parse_rule
+from scheduler import TickScheduler
+from snapshot import TimerState
+from validation import InputError, parse_alarm_time, parse_timer_duration
 
 class ClockController:
     
-    def __init__(self, model):
+    def __init__(self, model, audio=None, commands=None):
         self.model = model
         self.view = None
+        # Commands from other processes (instance.py, control_api.py), applied at the start of a tick
+        self.commands = commands if commands is not None else queue.Queue()
+        self._draining = False
+        # Aims every tick at the next wall-clock second instead of a fixed 1000 ms
+        self.scheduler = TickScheduler()
+        # Sounds play on their own thread; triggering one is only a queue put
+        self.audio = audio if audio is not None else AudioWorker()
         
     def set_view(self, view):
         """Sets the single main view reference."""
         self.view = view
         
     def update_clock(self):
+        # 0. Record tick lateness (jitter / missed seconds) before doing any work
+        self.scheduler.tick_started()
+
+        # 1-4. Timers, view refresh, notifications
+        try:
+            self.process_tick()
+        finally:
+            # 5. Whatever went wrong above, the clock keeps ticking
+            self.schedule_next_tick()
+
+    def schedule_next_tick(self):
+        """Reschedules update_clock() and stores the ID for safe shutdown."""
+        if self.view:
+            # FIX: Capture the ID returned by after() and store it in the View.
+            # The delay lands just past the next second boundary, so our own work time
+            # and Tk latency never accumulate into drift.
+            delay_ms = self.scheduler.next_delay_ms()
+            new_after_id = self.view.after(delay_ms, self.update_clock)
+            self.view.after_id = new_after_id # <-- Store ID in the View instance
+            self.schedule_timer_deadline(delay_ms)
+
+            # A large batch is applied in chunks between events rather than one chunk per second
+            if not self._draining and not self.commands.empty():
+                self._draining = True
+                self.view.after(1, self.drain_commands)
+
+    def process_tick(self):
+        """One tick of clock logic without any scheduling (shared by the Tk and headless loops)."""
+        # Apply commands from other launches that arrived since the last tick
+        self.process_commands()
+
         # 1. Tick the timer (essential for countdown)
         self.model.tick_timer()
 
-        # 2. Fetch all updated data from the Model
-        time_str = self.model.get_time_string()
-        date_str = self.model.get_date_string()
-        format_status = self.model.get_format_status()
-        
+        # 2-3. Fetch all updated data from the Model and update the View
+        self.refresh_view()
+
+        # 4. Sound Trigger (Alarm or Timer)
+        self.play_notification()
+
+    def process_commands(self, limit=256):
+        """
+        Applies up to 'limit' queued commands, so a flood can never stall a tick.
+        Queue entries are (command, on_done) pairs; on_done, if set, receives
+        (result, error) once the command has been applied.
+        """
+        for _ in range(limit):
+            try:
+                command, on_done = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result, error = self.apply_command(command), None
+            except (ValueError, KeyError) as e:
+                result, error = None, getattr(e, "message", str(e))
+            except Exception as e:
+                # A bug in one command must not cost the rest of the tick (or the caller its answer)
+                print(f"Command {command[0]!r} failed: {e!r}")
+                result, error = None, f"Internal error: {e}"
+            if on_done is not None:
+                on_done(result, error)
+
+    def drain_commands(self):
+        """Applies the next chunk of a command backlog, rescheduling itself until the queue is empty."""
+        self.process_commands()
+        self.refresh_view()
+        if self.view and not self.commands.empty():
+            self.view.after(1, self.drain_commands)
+        else:
+            self._draining = False
+
+    def apply_command(self, command):
+        """Applies one command tuple from validation.parse_command() and returns its result."""
+        name = command[0]
+        if name == "focus":
+            if self.view:
+                self.view.focus_window()
+        elif name == "alarm":
+            return self.model.add_alarm(command[1], command[2], rule=command[3])
+        elif name == "timer":
+            self.model.set_timer(*command[1:])
+            self.model.start_timer()
+        elif name == "add_timer":
+            timer_id = self.model.timers.create(command[1])
+            self.model.timers.start(timer_id)
+            return timer_id
+        elif name == "remove_alarm":
+            return self.model.remove_alarm(command[1])
+        elif name == "remove_timer":
+            return self.model.timers.remove(command[1])
+        return None
+
+    def refresh_view(self):
+        """Pulls the current state from the Model and pushes it to the View."""
+        # 2. Fetch all updated data from the Model in one call (one clock read per tick)
+        #    The world clock is the one expensive field; skip it while its tab is hidden.
+        include_world = bool(self.view) and self.view.is_frame_visible("World")
+        snapshot = self.model.snapshot(include_world=include_world)
+
         # 3. Update the View
         if self.view:
-            self.view.update_displays({
-                "time_str": time_str,
-                "date_str": date_str,
-                "format_status": format_status,
-                "alarm_status": self.model.get_alarm_status(),
-                "timer_str": self.model.get_timer_string(),
-                "timer_status": self.model.get_timer_status(),
-                "tz_key": self.model.get_selected_timezone_key()
-            })
-
-        # 4. Sound Trigger (Alarm or Timer) - Using winsound.PlaySound() for custom WAV/system sounds
+            self.view.update_displays(snapshot)
+
+    def play_notification(self):
+        """Beeps if the alarm or the timer fired since the last check."""
         # if self.model.get_just_triggered_status() or self.model.get_timer_just_finished_status():
         #     try:
         #         # --- TO CHANGE SOUND ---
@@ -219,25 +320,76 @@ class ClockController:
         #         print(f"Winsound error: {e}")
         #         os.system('echo -e "\a"')
 
-        if self.model.get_just_triggered_status() or self.model.get_timer_just_finished_status():
-            try:
-                # Simple 1-second beep at 1000 Hz
-                winsound.Beep(1000, 1000) 
+        fired_alarms = self.model.pop_fired_alarms()
+        finished_timer_ids = self.model.pop_finished_timer_ids()
+        alarm_triggered = self.model.get_just_triggered_status()
+        timer_finished = self.model.get_timer_just_finished_status()
 
-            except Exception as e:
-                print(f"Winsound error: {e}")
-                os.system('echo -e "\a"')
+        if alarm_triggered or timer_finished:
+            # Simple 1-second beep at 1000 Hz, played off the Tk thread
+            self.audio.trigger(1000, 1000)
+
+        if self.view and (fired_alarms or finished_timer_ids or timer_finished):
+            self.view.notify(fired_alarms, finished_timer_ids, timer_finished)
+
+    def report_missed(self, missed_alarms, expired_timers):
+        """Tells the user what came due while the app was closed (see ClockModel.attach_journal)."""
+        if not (missed_alarms or expired_timers):
+            return
+        lines = [f"Alarm {record['hour']:02d}:{record['minute']:02d} was missed." for record in missed_alarms]
+        lines += ["The timer finished." if record["id"] is None else f"Timer {record['id']} finished."
+                  for record in expired_timers]
+        self.view.show_info("While You Were Away", "\n".join(lines))
+
+    def schedule_timer_deadline(self, next_tick_ms):
+        """
+        If the countdown expires before the next regular tick, books a one-shot
+        callback at the exact deadline so firing never waits for the tick grid.
+        """
+        if self.view.timer_after_id is not None:
+            self.view.after_cancel(self.view.timer_after_id)
+            self.view.timer_after_id = None
+
+        if self.model.get_timer_state() is not TimerState.RUNNING:
+            return
+
+        deadline_ms = math.ceil(self.model.get_timer_remaining() * 1000)
+        if deadline_ms < next_tick_ms:
+            self.view.timer_after_id = self.view.after(deadline_ms, self.timer_deadline_reached)
+
+    def timer_deadline_reached(self):
+        self.view.timer_after_id = None
+        self.model.tick_timer()
+        if self.model.get_timer_just_finished_status():
+            self.refresh_view()
+            self.play_notification()
 
-        # 5. Reschedule the next tick and store the ID for safe shutdown
-        if self.view:
-            # FIX: Capture the ID returned by after() and store it in the View.
-            new_after_id = self.view.after(1000, self.update_clock)
-            self.view.after_id = new_after_id # <-- Store ID in the View instance
-            
     # --- Data Retrieval Methods ---
     def get_timezone_keys(self):
         return self.model.get_timezone_keys()
 
+    def get_world_zone_labels(self):
+        return self.model.get_world_zone_labels()
+
+    def get_tick_stats(self):
+        return self.scheduler.get_stats()
+
+    def get_render_stats(self):
+        return self.view.last_render_stats if self.view else None
+
+    def get_next_wakeup(self):
+        """
+        Returns the seconds until the next alarm or timer expiry or journal fsync
+        (0 while commands are queued, None if nothing is pending), so a loop
+        without a visible clock can sleep until then.
+        """
+        if not self.commands.empty():
+            return 0.0  # Queued commands are due now
+        waits = [self.model.get_seconds_until_next_alarm(), self.model.get_seconds_until_next_timer(),
+                 self.model.get_seconds_until_journal_sync()]
+        waits = [w for w in waits if w is not None]
+        return min(waits) if waits else None
+
     # --- Action Methods ---
     
     def toggle_format_action(self):
@@ -247,34 +399,43 @@ class ClockController:
         selected_tz_key = self.view.frames["Time"].tz_var.get()
         self.model.set_timezone(selected_tz_key)
 
-    def set_alarm_action(self):
-        alarm_frame = self.view.frames["Alarm"]
-    
-        hour_raw = alarm_frame.alarm_hour_var.get().strip()
-        minute_raw = alarm_frame.alarm_minute_var.get().strip()
-
-        if not (hour_raw.isdigit() and minute_raw.isdigit()):
-            messagebox.showerror("Invalid Input", "Alarm time must contain only digits.")
-            alarm_frame.alarm_hour_var.set("00")
-            alarm_frame.alarm_minute_var.set("00")
+    def timezone_search_action(self, event):
+        # Navigation keys drive the dropdown itself; everything else refines the search
+        if event.keysym in ("Return", "Up", "Down", "Escape", "Tab"):
             return
+        time_frame = self.view.frames["Time"]
+        time_frame.tz_combobox['values'] = self.model.search_timezones(time_frame.tz_var.get())
 
-        hour = int(hour_raw)
-        minute = int(minute_raw)
-
-        if not (0 <= hour <= 23):
-            messagebox.showerror("Invalid Hour", "Hour must be between 00 and 23.")
-            alarm_frame.alarm_hour_var.set("00")
+    def timezone_entered_action(self, event):
+        time_frame = self.view.frames["Time"]
+        typed = time_frame.tz_var.get()
+        if self.model.set_timezone(typed):
             return
+        # Not an exact name: take the best match for what was typed
+        matches = self.model.search_timezones(typed, limit=1)
+        if matches:
+            time_frame.tz_var.set(matches[0])
+            self.model.set_timezone(matches[0])
 
-        if not (0 <= minute <= 59):
-            messagebox.showerror("Invalid Minute", "Minutes must be between 00 and 59.")
-            alarm_frame.alarm_minute_var.set("00")
-            return
+    def set_alarm_action(self):
+        alarm_frame = self.view.frames["Alarm"]
 
-        self.model.set_alarm(hour, minute)
+        try:
+            hour, minute = parse_alarm_time(alarm_frame.alarm_hour_var.get(), alarm_frame.alarm_minute_var.get())
+            rule = parse_rule(alarm_frame.alarm_repeat_var.get())
+        except InputError as e:
+            self.view.show_error(e.title, e.message)
+            if e.field in (None, "hour"):
+                alarm_frame.alarm_hour_var.set("00")
+            if e.field in (None, "minute"):
+                alarm_frame.alarm_minute_var.set("00")
+            return
 
+        self.model.set_alarm(hour, minute, rule)
 
+    def dismiss_alarm_action(self):
+        self.model.dismiss_alarm()
+        self.refresh_view()
 
     def clear_alarm_action(self):
         alarm_frame = self.view.frames["Alarm"]
@@ -282,47 +443,33 @@ class ClockController:
 
         alarm_frame.alarm_hour_var.set("00")
         alarm_frame.alarm_minute_var.set("00")
+        alarm_frame.alarm_repeat_var.set("Once")
 
     def set_timer_action(self):
         timer_frame = self.view.frames["Timer"]
 
-        h_raw = timer_frame.timer_hour_var.get().strip()
-        m_raw = timer_frame.timer_minute_var.get().strip()
-        s_raw = timer_frame.timer_second_var.get().strip()
-
-        if not (h_raw.isdigit() and m_raw.isdigit() and s_raw.isdigit()):
-            messagebox.showerror("Invalid Input", "Timer fields must contain digits only.")
-            timer_frame.timer_hour_var.set("00")
-            timer_frame.timer_minute_var.set("00")
-            timer_frame.timer_second_var.set("00")
-            return
-
-        hours = int(h_raw)
-        minutes = int(m_raw)
-        seconds = int(s_raw)
-
-        if not (0 <= hours <= 99):
-            messagebox.showerror("Invalid Hours", "Hours must be between 00 and 99.")
-            timer_frame.timer_hour_var.set("00")
-            return
-
-        if not (0 <= minutes <= 59):
-            messagebox.showerror("Invalid Minutes", "Minutes must be between 00 and 59.")
-            timer_frame.timer_minute_var.set("00")
-            return
-
-        if not (0 <= seconds <= 59):
-            messagebox.showerror("Invalid Seconds", "Seconds must be between 00 and 59.")
-            timer_frame.timer_second_var.set("00")
+        try:
+            hours, minutes, seconds = parse_timer_duration(
+                timer_frame.timer_hour_var.get(),
+                timer_frame.timer_minute_var.get(),
+                timer_frame.timer_second_var.get())
+        except InputError as e:
+            self.view.show_error(e.title, e.message)
+            if e.field in (None, "hour"):
+                timer_frame.timer_hour_var.set("00")
+            if e.field in (None, "minute"):
+                timer_frame.timer_minute_var.set("00")
+            if e.field in (None, "second"):
+                timer_frame.timer_second_var.set("00")
             return
 
         self.model.set_timer(hours, minutes, seconds)
 
     def start_stop_timer_action(self):
-        status = self.model.get_timer_status()
-        if status == "RUNNING":
+        state = self.model.get_timer_state()
+        if state is TimerState.RUNNING:
             self.model.stop_timer()
-        elif status in ["READY", "TIMER FINISHED!"]:
+        elif state in (TimerState.READY, TimerState.FINISHED):
             self.model.start_timer()
 
     def reset_timer_action(self):
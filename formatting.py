@@ -0,0 +1,51 @@
+# formatting.py
+# Lookup tables that turn clock and timer formatting into list indexing.
+# Each table is built the first time it is needed (a few ms) and then shared.
+
+TWO_DIGITS = [f"{n:02d}" for n in range(100)]
+
+_tables = {}
+
+
+def _build_time_24():
+    two = TWO_DIGITS
+    return [f"{two[h]}:{two[m]}:{two[s]}" for h in range(24) for m in range(60) for s in range(60)]
+
+
+def _build_time_12():
+    two = TWO_DIGITS
+    return [f"{two[h % 12 or 12]}:{two[m]}:{two[s]} {'AM' if h < 12 else 'PM'}"
+            for h in range(24) for m in range(60) for s in range(60)]
+
+
+def _build_minutes_seconds():
+    two = TWO_DIGITS
+    return [f":{two[m]}:{two[s]}" for m in range(60) for s in range(60)]
+
+
+_BUILDERS = {
+    "24": _build_time_24,
+    "12": _build_time_12,
+    "mmss": _build_minutes_seconds,
+}
+
+
+def get_table(name):
+    """Returns one of the precomputed tables ('24', '12' or 'mmss'), building it once."""
+    table = _tables.get(name)
+    if table is None:
+        table = _tables[name] = _BUILDERS[name]()
+    return table
+
+
+def format_clock(hour, minute, second, is_24_hour_format=True):
+    """Returns 'HH:MM:SS' (or 'hh:MM:SS AM/PM') for a wall time, like strftime."""
+    table = get_table("24" if is_24_hour_format else "12")
+    return table[hour * 3600 + minute * 60 + second]
+
+
+def format_duration(seconds):
+    """Returns 'HH:MM:SS' for a duration in whole seconds (hours may exceed 24)."""
+    hours, rest = divmod(seconds, 3600)
+    hours_str = TWO_DIGITS[hours] if hours < 100 else str(hours)
+    return hours_str + get_table("mmss")[rest]
@@ -0,0 +1,147 @@
+# gif_player.py
+import base64
+import queue
+import threading
+import tkinter as tk
+
+import image_cache
+
+# How long to look again when the decoder has not delivered the next frame yet
+WAIT_MS = 20
+# Browsers play GIF delays of 10 ms or less at 100 ms; so do we
+MIN_DELAY_MS = 11
+DEFAULT_DELAY_MS = 100
+
+
+class GifPlayer:
+    """
+    Plays an animated GIF in a Label at its native frame delays.
+
+    A worker thread decodes and resizes the frames (or reads them from
+    image_cache) and hands them over through a small bounded queue. If the
+    player is stopped first, the worker still completes the frame cache. The Tk
+    thread only turns a ready PNG into a PhotoImage and swaps it in, from
+    step(), so the player runs as one animation of an AnimationScheduler. Once
+    a full pass has been seen, playback loops over the frames kept in memory,
+    unless the GIF has more than max_cached_frames frames; then the worker
+    keeps streaming them and nothing is kept.
+    """
+
+    def __init__(self, label, source, size, max_cached_frames=64, prefetch=4):
+        self.label = label
+        self.source = source
+        self.size = size
+        self.max_cached_frames = max_cached_frames
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_at = None      # When the frame after the shown one is due
+        self._cache = []          # (PhotoImage, delay) per frame, in order
+        self._streaming = False   # Too many frames to keep; play straight from the queue
+        self._looping = False     # Every frame is cached; the worker is done
+        self._index = 0
+        self._current = None      # Keeps the shown PhotoImage alive
+
+    def start(self):
+        """Starts decoding; frames are shown by calling step() (see AnimationScheduler)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._decode, name="gif-decoder", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # --- Worker thread ---
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _decode(self):
+        try:
+            while True:
+                count = 0
+                frames = image_cache.iter_frames(self.source, self.size)
+                for data, delay in frames:
+                    # Tk's -data option takes base64 text
+                    if not self._put((base64.b64encode(data).decode("ascii"), delay)):
+                        # Stopped (e.g. the splash closed): still finish the pass, so a
+                        # cold cache gets all its frames and manifest for the next launch
+                        for _ in frames:
+                            pass
+                        return
+                    count += 1
+                # None marks the end of a pass; a GIF that fits the cache needs only one
+                if not self._put(None) or count <= self.max_cached_frames:
+                    return
+        except Exception as e:
+            print("Splash animation could not load:", e)
+
+    # --- Tk thread ---
+
+    def _next_frame(self):
+        if self._looping:
+            frame = self._cache[self._index]
+            self._index = (self._index + 1) % len(self._cache)
+            return frame
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return None
+            if item is not None:
+                break
+            if not self._streaming:
+                if not self._cache:
+                    self.stop()  # Nothing decodable
+                    return None
+                self._looping = True
+                return self._next_frame()
+
+        data, delay = item
+        frame = (tk.PhotoImage(master=self.label, data=data), delay if delay >= MIN_DELAY_MS else DEFAULT_DELAY_MS)
+        if not self._streaming:
+            if len(self._cache) < self.max_cached_frames:
+                self._cache.append(frame)
+            else:
+                self._streaming = True
+                self._cache = []
+        return frame
+
+    def step(self, now):
+        """Shows the frame due at 'now'; returns when the next one is due (None once stopped)."""
+        if self._stop.is_set():
+            return None
+        if self._next_at is not None and now < self._next_at:
+            return self._next_at
+
+        frame = self._next_frame()
+        if frame is None:
+            # The decoder is behind (first run only); keep the current frame
+            return None if self._stop.is_set() else now + WAIT_MS / 1000
+
+        if self._looping and self._next_at is not None:
+            # Running late (e.g. during a blocking warm-up stage): skip the frames
+            # whose time has already passed, but stay on the GIF's own time grid
+            for _ in range(len(self._cache)):
+                if now - self._next_at < frame[1] / 1000:
+                    break
+                self._next_at += frame[1] / 1000
+                frame = self._next_frame()
+            else:
+                self._next_at = now
+            base = self._next_at
+        else:
+            base = now
+
+        image, delay = frame
+        self.label.configure(image=image)
+        self._current = image
+        self._next_at = base + delay / 1000
+        return self._next_at
@@ -0,0 +1,188 @@
+# headless.py
+# Runs the clock engine (model, alarms, timers) without Tkinter, e.g. on a server:
+#   python headless.py --alarm 07:30 --timer 00:25:00 --beep
+# Nothing in this import chain loads tkinter or winsound.
+import argparse
+import sys
+import threading
+import time
+
+from alarm_import import import_alarms
+from audio import AudioWorker, NullBackend, default_backend
+from controller import ClockController
+from journal import Journal, default_directory
+from models import ClockModel
+from recurrence import parse_rule
+from scheduler import clamp_sleep
+from validation import InputError, parse_alarm_time, parse_clock_text, parse_timer_duration
+
+
+class ConsoleView:
+    """
+    The controller's view interface for a process without a window. Nothing is
+    visible, so no tick ever renders anything; events are printed instead.
+    """
+
+    def __init__(self, out=sys.stdout):
+        self.out = out
+
+    def update_displays(self, snapshot):
+        pass
+
+    def is_frame_visible(self, name):
+        return False
+
+    def focus_window(self):
+        pass
+
+    def show_error(self, title, message):
+        print(f"{title}: {message}", file=sys.stderr)
+
+    def show_info(self, title, message):
+        print(f"{title}:\n{message}", file=self.out, flush=True)
+
+    def notify(self, fired_alarms, finished_timer_ids, timer_finished):
+        stamp = time.strftime("%H:%M:%S")
+        for alarm in fired_alarms:
+            print(f"[{stamp}] ALARM {alarm.get_time_string()} (id {alarm.alarm_id})", file=self.out, flush=True)
+        for timer_id in finished_timer_ids:
+            print(f"[{stamp}] TIMER {timer_id} FINISHED", file=self.out, flush=True)
+        if timer_finished and not finished_timer_ids:
+            print(f"[{stamp}] TIMER FINISHED", file=self.out, flush=True)
+
+
+class HeadlessRuntime:
+    """
+    Drives ClockController.process_tick() from a plain loop. Between events the
+    thread blocks on an Event until the next alarm or timer is due, so an idle
+    daemon costs (almost) no CPU. wake() makes it re-check immediately after
+    alarms or timers were changed from another thread; stop() ends run().
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self._wakeup = threading.Event()
+        self._running = False
+        self.ticks = 0
+
+    def run(self):
+        self._running = True
+        while self._running:
+            self.controller.process_tick()
+            self.ticks += 1
+
+            self._wakeup.wait(clamp_sleep(self.controller.get_next_wakeup()))
+            self._wakeup.clear()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the clock's alarms and timers without a window.")
+    parser.add_argument("--alarm", action="append", default=[], metavar="HH:MM",
+                        help="add an alarm (may be repeated)")
+    parser.add_argument("--repeat", metavar="RULE",
+                        help="repeat the --alarm alarms, e.g. 'weekdays', 'mon,thu' or 'every 2 days'")
+    parser.add_argument("--timer", action="append", default=[], metavar="HH:MM:SS",
+                        help="start a countdown (may be repeated)")
+    parser.add_argument("--import", dest="imports", action="append", default=[], metavar="FILE",
+                        help="add every alarm in a CSV or .ics file (may be repeated)")
+    parser.add_argument("--timezone", help="timezone for alarms, e.g. 'Europe/Berlin'")
+    parser.add_argument("--beep", action="store_true", help="play a sound when something fires")
+    parser.add_argument("--asyncio", action="store_true", help="run on an asyncio event loop")
+    parser.add_argument("--state-dir", default=default_directory(),
+                        help="where alarms and timers are persisted (default: %(default)s)")
+    parser.add_argument("--no-journal", action="store_true", help="keep alarms and timers in memory only")
+    parser.add_argument("--api-port", type=int, metavar="PORT",
+                        help="serve the local control API on 127.0.0.1:PORT")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    model = ClockModel()
+    audio = AudioWorker(default_backend() if args.beep else NullBackend())
+    controller = ClockController(model, audio)
+    controller.set_view(ConsoleView())
+
+    if not args.no_journal:
+        try:
+            controller.report_missed(*model.attach_journal(Journal(args.state_dir)))
+        except OSError as e:
+            print(f"Journal error: {e}. Use --state-dir or --no-journal to run alongside it.", file=sys.stderr)
+            return 2
+
+    try:
+        if args.timezone and not model.set_timezone(args.timezone):
+            raise InputError("Invalid Timezone", f"Unknown timezone '{args.timezone}'.")
+        rule = parse_rule(args.repeat or "")
+        for text in args.alarm:
+            hour, minute = parse_alarm_time(*parse_clock_text(text, 2))
+            model.add_alarm(hour, minute, rule=rule)
+        for text in args.timer:
+            hours, minutes, seconds = parse_timer_duration(*parse_clock_text(text, 3))
+            total = hours * 3600 + minutes * 60 + seconds
+            if total == 0:
+                raise InputError("Invalid Timer", "Timer duration must be positive.")
+            timer_id = model.timers.create(total)
+            model.timers.start(timer_id)
+    except InputError as e:
+        print(f"{e.title}: {e.message}", file=sys.stderr)
+        return 2
+
+    for path in args.imports:
+        try:
+            report = import_alarms(model, path)
+        except OSError as e:
+            print(f"Import failed: {e}", file=sys.stderr)
+            return 2
+        print(f"{path}: {report.summary()}")
+        for line_no, message in report.errors:
+            print(f"  line {line_no}: {message}", file=sys.stderr)
+
+    alarms = model.list_alarms()
+    if len(alarms) > 20:
+        print(f"{len(alarms)} alarms set, next at {alarms[0]['time']}")
+    else:
+        for alarm in alarms:
+            repeat = f", repeating {alarm['repeat']}" if alarm["repeat"] else ""
+            date = f" on {alarm['date']}" if alarm["date"] else ""
+            print(f"Alarm {alarm['id']} set for {alarm['time']}{date}{repeat}")
+    for timer_id, remaining, _ in model.timers.list():
+        print(f"Timer {timer_id} running ({remaining:.0f} s)")
+
+    if args.asyncio:
+        from async_runtime import AsyncClockRuntime
+        runtime = AsyncClockRuntime(controller)
+    else:
+        runtime = HeadlessRuntime(controller)
+
+    api = None
+    if args.api_port is not None:
+        from control_api import ControlServer
+        api = ControlServer(controller.commands, args.api_port, on_command=runtime.wake,
+                            directory=args.state_dir)
+        if api.start():
+            print(f"Control API listening on 127.0.0.1:{api.port} (token in {api.token_path})")
+        else:
+            api = None
+    try:
+        runtime.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if api is not None:
+            api.close()
+        audio.stop(timeout=1)
+        model.close_journal()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# image_cache.py
+# Resized copies of images, stored as PNG files that tk.PhotoImage reads natively
+# (Tk 8.6+). The cache key is the source's absolute path, mtime and size plus the
+# target size, so editing or replacing the source simply misses the cache.
+# PIL is only imported to build a missing entry; warm starts never load it.
+import hashlib
+import io
+import json
+import os
+import tkinter as tk
+
+
+def default_directory():
+    """Returns the per-user cache directory for the clock."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "time_utility", "images")
+
+
+def cache_path(source, size, directory=None):
+    """Returns where the resized copy of 'source' is cached."""
+    source = os.path.abspath(source)
+    stat = os.stat(source)
+    key = f"{source}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(directory or default_directory(), f"{name}-{size[0]}x{size[1]}-{digest}.png")
+
+
+def _write_atomic(path, data):
+    # Write under a temporary name so a crash never leaves a truncated entry
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _encode_png(img):
+    buffer = io.BytesIO()
+    # Fast deflate: the files are small either way and encoding dominated the cold build
+    img.save(buffer, "PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def _prune(path):
+    # Entries for older versions of the same source are never hit again
+    directory, current = os.path.split(path)
+    prefix, digest = current[:-len(".png")].rsplit("-", 1)
+    for entry in os.listdir(directory):
+        if entry.startswith(prefix + "-") and digest not in entry:
+            try:
+                os.remove(os.path.join(directory, entry))
+            except OSError:
+                pass
+
+
+def build(source, size, path):
+    """Decodes, resizes and writes one cache entry (the slow path that needs PIL)."""
+    from PIL import Image
+
+    with Image.open(source) as img:
+        img = img.convert("RGBA").resize(size, Image.LANCZOS)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_atomic(path, _encode_png(img))
+    _prune(path)
+
+
+def get_resized_path(source, size, directory=None):
+    """Returns the path of a PNG with 'source' resized to 'size', building it on a miss."""
+    path = cache_path(source, size, directory=directory)
+    if not os.path.exists(path):
+        build(source, size, path)
+    return path
+
+
+def iter_frames(source, size, directory=None):
+    """
+    Yields (PNG bytes, delay in ms) for every frame of an animated image resized
+    to 'size'. The first run decodes with PIL and caches each frame next to a
+    small manifest of the delays; later runs only read the cached files.
+    """
+    path = cache_path(source, size, directory)
+    base = path[:-len(".png")]
+    manifest_path = base + "-frames.json"
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            delays = json.load(f)["delays"]
+    except (OSError, ValueError, KeyError):
+        delays = None
+    if delays is not None and all(os.path.exists(f"{base}-f{i}.png") for i in range(len(delays))):
+        for i, delay in enumerate(delays):
+            with open(f"{base}-f{i}.png", "rb") as f:
+                yield f.read(), delay
+        return
+
+    from PIL import Image, ImageSequence
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    delays = []
+    with Image.open(source) as img:
+        for i, frame in enumerate(ImageSequence.Iterator(img)):
+            delay = frame.info.get("duration", 100)
+            data = _encode_png(frame.convert("RGBA").resize(size, Image.LANCZOS))
+            _write_atomic(f"{base}-f{i}.png", data)
+            delays.append(delay)
+            yield data, delay
+    _write_atomic(manifest_path, json.dumps({"delays": delays}).encode("utf-8"))
+    _prune(path)
+
+
+def load_photo(master, source, size, directory=None):
+    """Returns a tk.PhotoImage of 'source' resized to 'size' (width, height)."""
+    return tk.PhotoImage(master=master, file=get_resized_path(source, size, directory))
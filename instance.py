@@ -0,0 +1,179 @@
+# instance.py
+# Single-instance support. The first launch owns a Unix-domain socket; later
+# launches send their commands to it (one JSON object per line) and exit. This
+# module must stay cheap to import: nothing from the GUI stack, PIL or pytz.
+#
+# The socket lives in a directory only this user can enter (XDG_RUNTIME_DIR,
+# or a 0700 directory of our own in the temp dir), so another local user can
+# neither take the name first nor connect; a socket owned by anyone else is
+# never sent commands.
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+
+from validation import parse_command
+
+
+def _private_directory():
+    # XDG_RUNTIME_DIR is per-user and 0700 by specification
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if directory:
+        return directory
+    if not hasattr(os, "getuid"):
+        return tempfile.gettempdir()  # Windows: the temp dir is already per-user
+    directory = os.path.join(tempfile.gettempdir(), f"time_utility-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    except OSError:
+        return None
+    info = os.lstat(directory)
+    # Someone else may have created the name first; only our own private directory will do
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        return None
+    return directory
+
+
+def socket_path():
+    """Returns the per-user socket path, or None if no private directory is available."""
+    directory = _private_directory()
+    if directory is None:
+        return None
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(directory, f"time_utility-{user}.sock")
+
+
+def _owned_by_us(path):
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        return os.stat(path).st_uid == os.getuid()
+    except OSError:
+        return False
+
+
+def forward(messages, path=None, timeout=1.0):
+    """
+    Sends command dicts to the running instance and returns its replies, one
+    {"ok": ..., "error": ...} dict per command. Returns None if no instance is
+    listening (the caller should become the instance).
+    """
+    path = path or socket_path()
+    if not hasattr(socket, "AF_UNIX") or path is None or not _owned_by_us(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall("".join(json.dumps(message) + "\n" for message in messages).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("r", encoding="utf-8") as replies:
+                return [json.loads(line) for line in replies]
+    except (OSError, ValueError):
+        return None
+
+
+def _is_listening(path):
+    # Only a refused/missing socket proves nobody owns it; anything else counts as alive
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+        except OSError:
+            return True
+    return True
+
+
+class InstanceServer:
+    """
+    Owns the socket and turns incoming lines into validated command tuples on
+    'commands' (the ClockController's queue, drained once per tick). Requests
+    are answered as soon as the command is queued; on_command, if given, is
+    called after each one (e.g. to wake a sleeping headless runtime).
+    """
+
+    def __init__(self, commands, path=None, on_command=None):
+        self.commands = commands
+        self.path = path or socket_path()
+        self.on_command = on_command
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        """Binds the socket. Returns False if another live instance owns it (or AF_UNIX is missing)."""
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        if self.path is None:
+            print("Instance: no private directory for the socket; running without single-instance support")
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            try:
+                sock.bind(self.path)
+            except OSError:
+                if _is_listening(self.path):
+                    sock.close()
+                    return False
+                # Left behind by an instance that crashed
+                os.unlink(self.path)
+                sock.bind(self.path)
+            # Listen at once: a bound socket that refuses connections looks stale to a racing launch
+            sock.listen(8)
+            os.chmod(self.path, 0o600)
+        except OSError as e:
+            print(f"Instance: could not own {self.path}: {e}")
+            sock.close()
+            return False
+
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+        return True
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)  # Wakes the blocked accept()
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except (OSError, AttributeError):
+                return  # Closed
+            with conn:
+                conn.settimeout(1.0)
+                try:
+                    self._handle(conn)
+                except (OSError, ValueError) as e:
+                    print(f"Instance: dropped a request: {e}")
+
+    def _handle(self, conn):
+        # Separate reader and writer: writing through a shared text wrapper drops its read-ahead
+        with conn.makefile("r", encoding="utf-8") as lines, \
+                conn.makefile("w", encoding="utf-8", newline="\n") as stream:
+            for line in lines:
+                try:
+                    command = parse_command(json.loads(line))
+                except ValueError as e:  # Bad JSON or an InputError
+                    reply = {"ok": False, "error": getattr(e, "message", str(e))}
+                else:
+                    self.commands.put((command, None))
+                    if self.on_command is not None:
+                        self.on_command()
+                    reply = {"ok": True}
+                stream.write(json.dumps(reply) + "\n")
+                stream.flush()
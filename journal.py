@@ -0,0 +1,223 @@
+# journal.py
+# Crash-safe persistence for alarms and timers.
+#
+# Every change is appended to <dir>/clock.journal as one JSON line and flushed
+# to the OS at once (a crashed process loses nothing); fsync() is batched to at
+# most one per sync_interval (a power cut loses at most that much, as long as
+# the owner calls sync() when seconds_until_sync() says so). After
+# compact_after records the current state is written atomically to
+# <dir>/clock.snapshot.json and the journal starts over, so a restore reads one
+# small snapshot plus a bounded tail no matter how long the clock has run.
+#
+# Records are idempotent upserts/removals keyed by id, so replaying a journal
+# over a snapshot that already contains some of it is harmless (a crash between
+# writing the snapshot and truncating the journal).
+#
+# Only one process may use a directory at a time: load() takes an exclusive
+# lock on <dir>/clock.lock and raises JournalLockedError if another clock
+# (window or headless) already holds it.
+import json
+import os
+import time
+
+SNAPSHOT_NAME = "clock.snapshot.json"
+JOURNAL_NAME = "clock.journal"
+LOCK_NAME = "clock.lock"
+
+
+class JournalLockedError(OSError):
+    """Another process is using the journal directory."""
+
+
+def _try_lock(f):
+    # Exclusive, non-blocking; released when the file is closed (or the process dies)
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt  # Windows
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def default_directory():
+    """Returns the per-user state directory for the clock."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_STATE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "time_utility")
+
+
+def empty_state():
+    return {
+        "timezone": None,    # Selected timezone key
+        "alarms": {},        # str(id) -> {"id", "hour", "minute", "tz", "fire_ts", "repeat", "date"}
+        "main_alarm": None,  # Id of the alarm typed into the Alarm tab
+        "timers": {},        # str(id) -> {"id", "total", "remaining", "deadline"}
+        "main_timer": None,  # {"total", "remaining", "deadline", "finished"}
+    }
+
+
+def _put_alarm(state, record):
+    alarm = {key: record[key] for key in ("id", "hour", "minute", "tz", "fire_ts")}
+    alarm["repeat"] = record.get("repeat")  # Absent in records written before repeat rules
+    alarm["date"] = record.get("date")      # Absent in records written before dated alarms
+    state["alarms"][str(record["id"])] = alarm
+
+
+def apply_record(state, record):
+    """Applies one journal record to a state dict. Deadlines are wall-clock UNIX times."""
+    op = record["op"]
+    if op == "alarm":
+        _put_alarm(state, record)
+    elif op == "alarms":
+        # A bulk import: one record for the whole batch instead of one per alarm
+        for alarm in record["alarms"]:
+            _put_alarm(state, alarm)
+    elif op == "alarm_remove":
+        state["alarms"].pop(str(record["id"]), None)
+        if state["main_alarm"] == record["id"]:
+            state["main_alarm"] = None
+    elif op == "main_alarm":
+        state["main_alarm"] = record["id"]
+    elif op == "timer":
+        state["timers"][str(record["id"])] = {key: record[key] for key in ("id", "total", "remaining", "deadline")}
+    elif op == "timer_remove":
+        state["timers"].pop(str(record["id"]), None)
+    elif op == "main_timer":
+        state["main_timer"] = {key: record[key] for key in ("total", "remaining", "deadline", "finished")}
+    elif op == "timezone":
+        state["timezone"] = record["key"]
+
+
+class Journal:
+    """
+    Append-only change log plus snapshot. load() once at startup, then
+    append() every change; call sync() regularly (e.g. once per tick) so
+    batched writes reach the disk, and close() on exit.
+    """
+
+    def __init__(self, directory, sync_interval=1.0, compact_after=1000, clock=time.monotonic):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+        self._clock = clock
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self._journal_path = os.path.join(directory, JOURNAL_NAME)
+        self._lock_path = os.path.join(directory, LOCK_NAME)
+        self._lock = None
+        self._file = None
+        self._dirty = False
+        self._last_sync = 0.0
+        self._records = 0  # Records in the journal since the last compaction
+        self.state = empty_state()
+
+        # --- Counters ---
+        self.fsyncs = 0
+        self.compactions = 0
+
+    def load(self):
+        """Reads snapshot + journal and returns the resulting state dict."""
+        os.makedirs(self.directory, exist_ok=True)
+        lock = open(self._lock_path, "a+b")
+        if not _try_lock(lock):
+            lock.close()
+            raise JournalLockedError(f"{self.directory} is in use by another clock process")
+        self._lock = lock
+        state = empty_state()
+        try:
+            with open(self._snapshot_path, "r", encoding="utf-8") as f:
+                state.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Journal: ignoring unreadable snapshot: {e}")
+
+        records = 0
+        valid_bytes = 0
+        try:
+            with open(self._journal_path, "rb") as f:
+                for line in f:
+                    # A torn last line (crash mid-write) ends the replay
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        apply_record(state, json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        print(f"Journal: stopping replay at a bad record: {e}")
+                        break
+                    valid_bytes += len(line)
+                    records += 1
+        except FileNotFoundError:
+            pass
+
+        self.state = state
+        self._records = records
+        self._file = open(self._journal_path, "ab")
+        # Drop a torn tail so the next record starts on a line of its own
+        if self._file.tell() != valid_bytes:
+            self._file.truncate(valid_bytes)
+        if records >= self.compact_after:
+            self.compact()
+        return state
+
+    def append(self, record):
+        """Logs one change. The write reaches the OS immediately; fsync is batched."""
+        apply_record(self.state, record)
+        self._file.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+        self._file.flush()
+        self._dirty = True
+        self._records += 1
+        if self._records >= self.compact_after:
+            self.compact()
+        else:
+            self.sync()
+
+    def sync(self, force=False):
+        """fsyncs pending writes if sync_interval has passed since the last fsync (or if forced)."""
+        if not self._dirty:
+            return
+        now = self._clock()
+        if force or now - self._last_sync >= self.sync_interval:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self._last_sync = now
+            self.fsyncs += 1
+
+    def seconds_until_sync(self):
+        """Returns how long until pending writes are due for fsync, or None if nothing is pending."""
+        if not self._dirty:
+            return None
+        return max(self._last_sync + self.sync_interval - self._clock(), 0)
+
+    def compact(self):
+        """Writes the state to the snapshot file atomically and starts an empty journal."""
+        tmp_path = self._snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        # Only now is it safe to forget the journal
+        self._file.truncate(0)
+        self._file.seek(0)
+        os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_sync = self._clock()
+        self._records = 0
+        self.compactions += 1
+
+    def close(self):
+        if self._file is not None:
+            self.sync(force=True)
+            self._file.close()
+            self._file = None
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
@@ -1,38 +1,202 @@
 # main.py
-import tkinter as tk
-from models import ClockModel
-from controller import ClockController
-from view import ClockView
-from splash import SplashScreen  # Make sure you save the previous splash class as splash.py
+import argparse
+import importlib
+import queue
+import sys
 
-def start_main_app():
-    """Creates the main app after splash screen closes."""
-    # 1. Create the Model
-    model = ClockModel()
+import instance
+from validation import InputError, parse_command
 
-    # 2. Create the Controller
-    controller = ClockController(model)
+# Imported during warm-up (see AppStartup.load_modules) so the splash is up first
+APP_MODULES = ("models", "controller", "view", "journal", "pytz")
 
-    # 3. Create the Main View Window
-    view = ClockView(controller)
 
-    # 4. Set the View reference in the Controller
-    controller.set_view(view)
+class AppStartup:
+    """
+    The real warm-up work, split into stages. With a splash each stage runs in
+    its own Tk callback and the progress bar advances as stages complete; the
+    splash closes as soon as the last one is done. The splash and the clock
+    live on the same (hidden until ready) root, i.e. one Tcl interpreter.
+    """
 
-    # 5. Manually start the clock update loop
-    controller.update_clock()
+    def __init__(self, root, use_asyncio=False, commands=None):
+        self.root = root
+        self.use_asyncio = use_asyncio
+        self.commands = commands
+        self.model = None
+        self.controller = None
+        self.view = None
+        self.missed = ([], [])
+        self.stages = [
+            ("Loading modules", self.load_modules),
+            ("Loading timezone data", self.load_timezones),
+            ("Restoring alarms and timers", self.restore_journal),
+            ("Building the window", self.build_view),
+        ]
+
+    # --- Stages ---
+
+    def load_modules(self):
+        for name in APP_MODULES:
+            importlib.import_module(name)
+
+    def load_timezones(self):
+        import pytz
+        from models import ClockModel
+
+        # 1. Create the Model
+        self.model = ClockModel()
+        # Load the zone files of the quick-pick list and build the format tables / date cache
+        for zone in ClockModel.COMMON_TIMEZONES.values():
+            if zone:
+                pytz.timezone(zone)
+        self.model.snapshot()
+
+    def restore_journal(self):
+        from journal import Journal, default_directory
+
+        try:
+            self.missed = self.model.attach_journal(Journal(default_directory()))
+        except OSError as e:
+            print(f"Journal error: {e}. Alarms and timers will not be saved.")
+
+    def build_view(self):
+        from controller import ClockController
+        from view import ClockView
+
+        # 2. Create the Controller
+        self.controller = ClockController(self.model, commands=self.commands)
+
+        # 3. Build the Main View (styles included) inside the root, still hidden
+        self.view = ClockView(self.controller, master=self.root)
+
+        # 4. Set the View reference in the Controller
+        self.controller.set_view(self.view)
+
+    # --- Running ---
+
+    def run_all(self):
+        """Runs every stage back to back (no splash)."""
+        for _, stage in self.stages:
+            stage()
+
+    def run_with_splash(self, splash, on_done, index=0):
+        """Runs stage 'index', shows the progress, and schedules the next stage."""
+        total = len(self.stages)
+        if index == 0:
+            splash.update_progress(0, total, self.stages[0][0])
+            splash.update_idletasks()
+
+        self.stages[index][1]()
+
+        index += 1
+        splash.update_progress(index, total, self.stages[index][0] if index < total else "Ready")
+        splash.update_idletasks()
+        if index < total:
+            # A 1 ms gap lets Tk repaint the splash between stages
+            splash.after(1, self.run_with_splash, splash, on_done, index)
+        else:
+            splash.after_idle(on_done)
+
+    def start_main_app(self):
+        """Shows the main window and starts the clock once warm-up is done."""
+        self.root.deiconify()
+
+        # 5. Manually start the clock update loop
+        if self.use_asyncio:
+            # Ticks and deadlines run as asyncio tasks on a worker thread
+            from async_runtime import AsyncClockRuntime, TkBridge
+            AsyncClockRuntime(self.controller, TkBridge(self.view)).start()
+        else:
+            self.controller.update_clock()
+
+        # The report is a modal dialog; show it with the clock already running
+        self.controller.report_missed(*self.missed)
+
+
+def forward_to_running(messages):
+    """Sends the commands to a running clock and exits; returns if none is listening."""
+    replies = instance.forward(messages or [{"cmd": "focus"}])
+    if replies is not None:
+        errors = [reply["error"] for reply in replies if not reply.get("ok")]
+        for error in errors:
+            print(error, file=sys.stderr)
+        sys.exit(2 if errors else 0)
 
-    # 6. Start Tkinter main loop
-    view.mainloop()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Professional Time Utility")
+    parser.add_argument("--asyncio", action="store_true", help="drive the clock from an asyncio event loop")
+    parser.add_argument("--no-splash", action="store_true", help="start without the splash screen")
+    parser.add_argument("--alarm", action="append", default=[], metavar="HH:MM", help="add an alarm")
+    parser.add_argument("--repeat", metavar="RULE", help="repeat the --alarm alarms, e.g. 'weekdays' or 'every 2 days'")
+    parser.add_argument("--timer", action="append", default=[], metavar="HH:MM:SS", help="start the timer")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="start another clock even if one is already running")
+    parser.add_argument("--api-port", type=int, metavar="PORT",
+                        help="serve the local control API on 127.0.0.1:PORT")
+    args = parser.parse_args()
+
+    messages = [{"cmd": "alarm", "time": text, "repeat": args.repeat} for text in args.alarm]
+    messages += [{"cmd": "timer", "duration": text} for text in args.timer]
+
+    # A clock is already running: hand it our commands and exit before loading Tk, PIL or pytz
+    if not args.new_instance:
+        forward_to_running(messages)
+
+    commands = queue.Queue()
+    try:
+        for message in messages:
+            commands.put((parse_command(message), None))
+    except InputError as e:
+        print(f"{e.title}: {e.message}", file=sys.stderr)
+        sys.exit(2)
+
+    # Own the socket before warming up, so a launch during startup is forwarded too
+    server = None
+    if not args.new_instance:
+        server = instance.InstanceServer(commands)
+        if not server.start():
+            server = None
+            # Another launch took the socket since we checked: it is the clock now
+            forward_to_running(messages)
+
+    # The control API only queues commands; the controller applies them once it is ticking
+    api = None
+    if args.api_port is not None:
+        from control_api import ControlServer
+        api = ControlServer(commands, args.api_port)
+        if not api.start():
+            api = None
+
+    import tkinter as tk
+
+    # One root for everything: hidden while warming up, then it becomes the clock window
     root = tk.Tk()
-    root.withdraw()  # Hide the root while splash shows
+    root.withdraw()
+    startup = AppStartup(root, args.asyncio, commands)
+
+    if args.no_splash:
+        startup.run_all()
+        # From inside the main loop, so the runtime's first posts and any modal report find it running
+        root.after_idle(startup.start_main_app)
+    else:
+        from splash import SplashScreen
+
+        # The splash stays up exactly as long as the warm-up stages take
+        splash = SplashScreen(root, image_path="DGIF.gif")
 
-    # Splash screen with a 3-second duration
-    splash = SplashScreen(root, duration=3000, image_path="DGIF.gif")
+        def finish():
+            splash.destroy()
+            startup.start_main_app()
 
-    # Schedule the main app to start after splash duration
-    root.after(3000, lambda: [splash.destroy(), start_main_app()])
+        root.after(1, startup.run_with_splash, splash, finish)
 
+    # 6. Start Tkinter main loop (ends when the clock window is closed)
     root.mainloop()
+    if server is not None:
+        server.close()
+    if api is not None:
+        api.close()
+    if startup.model is not None:
+        startup.model.close_journal()
@@ -1,6 +1,16 @@
 # models.py
 import datetime
+import locale
+import math
+import time
 import pytz
+from alarms import AlarmQueue
+from recurrence import Rule
+from snapshot import AlarmState, ClockSnapshot, TimerState
+from timing_wheel import MultiTimer
+import tz_catalog
+from formatting import format_clock, format_duration
+from world_clock import WorldClock
 
 class ClockModel:
     COMMON_TIMEZONES = {
@@ -16,42 +26,92 @@ class ClockModel:
         self._is_24_hour_format = True
         self._selected_timezone_key = "Local Time"
         self._selected_timezone = None 
+        self._tzinfo = None  # Resolved once in set_timezone(); None means local time
+        self._now = None     # The one time reading shared by every getter in a tick
+        self._date_cache = None  # (utc offset, valid from, valid until, date string)
         
+        # All alarms live in a heap keyed by next fire instant; the alarm typed into
+        # the Alarm tab is just the one whose id is kept in _alarm_id.
+        self._alarms = AlarmQueue()
+        self._alarm_id = None
         self._alarm_time = None 
         self._alarm_set = False
         self._alarm_triggered = False
         self._just_triggered = False 
+        self._fired_alarms = []
 
+        # Countdown state: while running only the monotonic deadline matters; while
+        # paused the remaining budget is kept in _timer_remaining_seconds.
+        self._clock = time.monotonic
         self._timer_total_seconds = 0
         self._timer_remaining_seconds = 0
+        self._timer_deadline = None
         self._timer_running = False
         self._timer_finished = False
         self._timer_just_finished = False
 
+        # Any number of extra countdowns keyed by id (e.g. one per test rig)
+        self.timers = MultiTimer(clock=self._clock)
+        self._finished_timer_ids = []
+
+        self._world_clock = None  # Built on first use (loads one zone file per city)
+
+        self._journal = None  # Optional Journal that persists alarms and timers (see attach_journal)
+
     def toggle_format(self):
         """Toggles between 12-hour and 24-hour format."""
         self._is_24_hour_format = not self._is_24_hour_format
 
+    def update_now(self):
+        """
+        Reads the clock once for this tick and checks the alarms against it. The
+        time and date getters all derive from this snapshot, so they can never
+        disagree (e.g. across midnight).
+        """
+        self._now = datetime.datetime.now(self._tzinfo)
+        self.check_alarm(self._now)
+        return self._now
+
+    def get_now(self):
+        """Returns the current tick's snapshot, taking one if none exists yet."""
+        if self._now is None:
+            self.update_now()
+        return self._now
+
+    def snapshot(self, include_world=False):
+        """
+        Takes this tick's time reading and returns everything the view shows as
+        one immutable ClockSnapshot.
+        """
+        self.update_now()
+        timer_state = self.get_timer_state()
+        # Positional arguments, in ClockSnapshot field order (cheaper than keywords)
+        return ClockSnapshot(
+            self.get_time_string(),
+            self.get_date_string(),
+            self.get_format_status(),
+            self._selected_timezone_key,
+            self.get_alarm_state(),
+            self.get_alarm_status(),
+            timer_state,
+            self.get_timer_string(),
+            timer_state.value,
+            self.get_world_times() if include_world else None,
+        )
+
     def get_time_string(self):
         """Returns the current time string based on the selected format and timezone."""
-        if self._selected_timezone:
-            try:
-                tz = pytz.timezone(self._selected_timezone)
-                now = datetime.datetime.now(tz)
-            except pytz.exceptions.UnknownTimeZoneError:
-                now = datetime.datetime.now()
-        else:
-            now = datetime.datetime.now()
+        now = self.get_now()
+        # Table lookup instead of strftime (same output as "%H:%M:%S" / "%I:%M:%S %p")
+        return format_clock(now.hour, now.minute, now.second, self._is_24_hour_format)
 
-        if self._is_24_hour_format:
-            time_str = now.strftime("%H:%M:%S")
-        else:
-            time_str = now.strftime("%I:%M:%S %p")
-            
-        # This call is now correctly inside the class and will work
-        self.check_alarm(now) 
-        
-        return time_str
+    def get_alarm_state(self):
+        """Returns the alarm state as an AlarmState."""
+        if self._alarm_triggered:
+            return AlarmState.TRIGGERED
+        elif self._alarm_set or self._alarms:
+            return AlarmState.SET
+        return AlarmState.OFF
 
     def get_alarm_status(self):
         """Returns the status of the alarm."""
@@ -61,37 +121,108 @@ class ClockModel:
             # Alarm time needs to be checked before using strftime
             if self._alarm_time: 
                  alarm_str = self._alarm_time.strftime("%H:%M")
-                 return f"ALARM SET: {alarm_str}"
+                 status = f"ALARM SET: {alarm_str}"
+                 main_alarm = self._alarms.get(self._alarm_id)
+                 if main_alarm is not None and main_alarm.rule is not None:
+                     status += f" ({main_alarm.rule.describe()})"
             else:
-                 return "ALARM SET" # Fallback if time somehow missing
+                 status = "ALARM SET" # Fallback if time somehow missing
+            others = len(self._alarms) - 1
+            return f"{status} (+{others})" if others > 0 else status
+        elif self._alarms:
+            return f"ALARMS SET: {len(self._alarms)}"
         else:
             return "ALARM OFF"
         
     def check_alarm(self, current_datetime):
-        """Checks if the current time matches the set alarm time."""
-        
-        # Only proceed if the alarm is SET and NOT already triggered (ringing).
-        if self._alarm_set and not self._alarm_triggered and self._alarm_time:
-            current_time = current_datetime.time()
-            
-            # Check if the current hour and minute match the set alarm time
-            if (current_time.hour == self._alarm_time.hour and 
-                current_time.minute == self._alarm_time.minute):
-                
-                # Alarm time reached!
-                self._alarm_triggered = True # Stops checking every second
-                self._just_triggered = True  # Signal to the Controller to play sound
-                self._alarm_set = False      # Disable alarm after first trigger
+        """Fires every alarm that is due. Only the heap head is inspected when nothing is."""
+        fired = self._alarms.pop_due(current_datetime.timestamp())
+        if not fired:
+            return
+
+        self._fired_alarms.extend(fired)
+        for alarm in fired:
+            self._journal_alarm(alarm.alarm_id)
+        self._just_triggered = True  # Signal to the Controller to play sound
+        # Only the Alarm-tab alarm flashes; extra alarms are reported through pop_fired_alarms()
+        if any(alarm.alarm_id == self._alarm_id for alarm in fired):
+            self._alarm_triggered = True # Stays until the alarm is cleared or set again
+        if self._alarm_id is not None and self._alarm_id not in self._alarms:
+            self._alarm_id = None
+            self._alarm_set = False  # Disable alarm after first trigger
                 
-    def set_alarm(self, hour, minute):
-        """Sets the alarm time."""
+    def set_alarm(self, hour, minute, rule=None):
+        """Sets the alarm time; with a recurrence.Rule it repeats instead of firing once."""
         try:
-            self._alarm_time = datetime.time(hour, minute)
-            self._alarm_set = True
-            self._alarm_triggered = False
+            alarm_id = self.add_alarm(hour, minute, rule=rule)
         except ValueError:
-            pass
-            
+            return
+        if self._alarm_id is not None:
+            self._alarms.remove(self._alarm_id)
+            self._journal_alarm(self._alarm_id)
+        self._alarm_id = alarm_id
+        if self._journal is not None:
+            self._journal.append({"op": "main_alarm", "id": alarm_id})
+        self._alarm_time = datetime.time(hour, minute)
+        self._alarm_set = True
+        self._alarm_triggered = False
+
+    def add_alarm(self, hour, minute, tz_name=None, rule=None, date=None):
+        """
+        Adds an extra alarm and returns its id. Without tz_name the alarm follows
+        the displayed timezone; with a recurrence.Rule it repeats; with a date it
+        fires once on that day. Raises ValueError for an invalid time.
+        """
+        alarm_id = self._alarms.add(hour, minute, time.time(), tz_name, rule=rule, date=date)
+        self._journal_alarm(alarm_id)
+        return alarm_id
+
+    def add_alarms(self, entries):
+        """
+        Adds many (hour, minute, tz_name, date) alarms at once (e.g. an imported
+        schedule) and returns their ids. The heap is rebuilt once and the batch
+        is journaled as a single record. Raises ValueError for an invalid time,
+        before anything is added.
+        """
+        alarm_ids = self._alarms.add_many(entries, time.time())
+        self._journal_alarms(alarm_ids)
+        return alarm_ids
+
+    def remove_alarm(self, alarm_id):
+        """Removes an alarm by id. Returns False if it does not exist."""
+        if alarm_id == self._alarm_id:
+            self._alarm_id = None
+            self._alarm_time = None
+            self._alarm_set = False
+        if not self._alarms.remove(alarm_id):
+            return False
+        self._journal_alarm(alarm_id)
+        return True
+
+    def get_alarm_timezone(self):
+        """Returns the zone that alarms without their own follow (None = local time)."""
+        return self._selected_timezone
+
+    def list_alarms(self):
+        """Returns the pending alarms, soonest first, as plain dicts."""
+        return [alarm.to_dict() for alarm in self._alarms.list()]
+
+    def get_next_alarm_timestamp(self):
+        """Returns the UNIX time of the next alarm, or None if no alarm is pending."""
+        return self._alarms.peek_fire_ts()
+
+    def get_seconds_until_next_alarm(self):
+        """Returns how long the caller may sleep before the next alarm, or None."""
+        fire_ts = self._alarms.peek_fire_ts()
+        if fire_ts is None:
+            return None
+        return max(fire_ts - time.time(), 0)
+
+    def pop_fired_alarms(self):
+        """Returns (and forgets) the alarms that fired since the last call."""
+        fired, self._fired_alarms = self._fired_alarms, []
+        return fired
+
     # CRITICAL FIX: This method must be inside the class to be called by the Controller.
     def get_just_triggered_status(self):
         """
@@ -107,8 +238,17 @@ class ClockModel:
             
         return status
 
+    def dismiss_alarm(self):
+        """Stops the triggered alarm flashing; unlike clear_alarm() a repeating alarm stays set."""
+        self._alarm_triggered = False
+        self._just_triggered = False
+
     def clear_alarm(self):
         """Clears the alarm."""
+        if self._alarm_id is not None:
+            self._alarms.remove(self._alarm_id)
+            self._journal_alarm(self._alarm_id)
+            self._alarm_id = None
         self._alarm_set = False
         self._alarm_time = None
         self._alarm_triggered = False
@@ -121,57 +261,110 @@ class ClockModel:
         """Sets the timer duration in seconds."""
         self._timer_total_seconds = hours * 3600 + minutes * 60 + seconds
         self._timer_remaining_seconds = self._timer_total_seconds
+        self._timer_deadline = None
         self._timer_running = False
         self._timer_finished = False
         self._timer_just_finished = False
+        self._journal_main_timer()
 
     def start_timer(self):
-        """Starts the countdown timer."""
+        """Starts (or resumes) the countdown by fixing an absolute deadline."""
         if self._timer_remaining_seconds > 0 and not self._timer_running:
+            self._timer_deadline = self._clock() + self._timer_remaining_seconds
             self._timer_running = True
             self._timer_finished = False
             self._timer_just_finished = False
+            self._journal_main_timer()
 
     def stop_timer(self):
-        """Stops the countdown timer."""
+        """Stops the countdown timer, keeping whatever budget is left."""
+        if self._timer_running:
+            self._timer_remaining_seconds = max(self._timer_deadline - self._clock(), 0)
+            self._timer_deadline = None
+            self._journal_main_timer()
         self._timer_running = False
 
     def reset_timer(self):
         """Resets the timer to its initial duration."""
         self._timer_total_seconds = 0
         self._timer_remaining_seconds = self._timer_total_seconds
+        self._timer_deadline = None
         self._timer_running = False
         self._timer_finished = False
         self._timer_just_finished = False
+        self._journal_main_timer()
+
+    def get_timer_remaining(self):
+        """Returns the remaining time in (fractional) seconds, computed from the deadline."""
+        if self._timer_running:
+            return max(self._timer_deadline - self._clock(), 0)
+        return self._timer_remaining_seconds
+
+    def get_seconds_until_next_timer(self):
+        """Returns the seconds until the Timer tab countdown or any extra timer expires, or None."""
+        waits = []
+        if self._timer_running:
+            waits.append(self.get_timer_remaining())
+        wake_at = self.timers.get_next_wakeup()
+        if wake_at is not None:
+            waits.append(max(wake_at - self._clock(), 0))
+        return min(waits) if waits else None
+
+    def get_seconds_until_journal_sync(self):
+        """Returns when tick_timer() must run again to fsync journaled changes, or None."""
+        if self._journal is None:
+            return None
+        return self._journal.seconds_until_sync()
 
     def tick_timer(self):
-        """Decrements the timer by one second if running."""
+        """Marks the timer finished once its deadline has passed. Safe to call at any rate."""
         self._timer_just_finished = False
-        if self._timer_running and self._timer_remaining_seconds > 0:
-            self._timer_remaining_seconds -= 1
-            if self._timer_remaining_seconds == 0:
-                self._timer_running = False
-                self._timer_finished = True
-                self._timer_just_finished = True
-
-    def get_timer_string(self):
-        """Returns the remaining time as an HH:MM:SS string."""
-        seconds = self._timer_remaining_seconds
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        seconds = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
-    def get_timer_status(self):
-        """Returns the status of the timer."""
+        finished_ids = self.timers.tick()
+        if finished_ids:
+            self._finished_timer_ids.extend(finished_ids)
+            self._timer_just_finished = True
+
+        if self._timer_running and self._clock() >= self._timer_deadline:
+            self._timer_remaining_seconds = 0
+            self._timer_deadline = None
+            self._timer_running = False
+            self._timer_finished = True
+            self._timer_just_finished = True
+            self._journal_main_timer()
+
+        if self._journal is not None:
+            self._journal.sync()  # Batched fsync of this tick's changes
+
+    def get_timer_string(self, tenths=False):
+        """Returns the remaining time as HH:MM:SS, or HH:MM:SS.t when tenths=True."""
+        remaining = self.get_timer_remaining()
+        if tenths:
+            # Round up so the display only reads zero once the deadline is reached
+            units = math.ceil(round(remaining * 10, 6))
+            seconds, tenth = divmod(units, 10)
+            return f"{format_duration(seconds)}.{tenth}"
+        return format_duration(math.ceil(round(remaining, 6)))
+
+    def get_timer_state(self):
+        """Returns the timer state as a TimerState."""
         if self._timer_finished:
-            return "TIMER FINISHED!"
+            return TimerState.FINISHED
         elif self._timer_running:
-            return "RUNNING"
+            return TimerState.RUNNING
         elif self._timer_total_seconds > 0:
-            return "READY"
+            return TimerState.READY
         else:
-            return "OFF"
+            return TimerState.OFF
+
+    def get_timer_status(self):
+        """Returns the status of the timer."""
+        return self.get_timer_state().value
+
+    def pop_finished_timer_ids(self):
+        """Returns (and forgets) the ids of extra timers that finished since the last call."""
+        finished, self._finished_timer_ids = self._finished_timer_ids, []
+        return finished
 
     def get_timer_just_finished_status(self):
         """Returns True if the timer just finished in this cycle."""
@@ -181,16 +374,27 @@ class ClockModel:
 
     def get_date_string(self):
         """Returns the current date and day of the week string for the selected timezone."""
-        if self._selected_timezone:
-            try:
-                tz = pytz.timezone(self._selected_timezone)
-                now = datetime.datetime.now(tz)
-            except pytz.exceptions.UnknownTimeZoneError:
-                now = datetime.datetime.now()
-        else:
-            now = datetime.datetime.now()
-            
-        return now.strftime("%a, %b %d, %Y")
+        now = self.get_now()
+        ts = now.timestamp()
+        offset = now.utcoffset()
+        offset = offset.total_seconds() if offset is not None else time.localtime(ts).tm_gmtoff
+
+        # The string only changes at local midnight. A DST change alters the UTC
+        # offset, which also misses the cache, so shifted or skipped midnights are
+        # recomputed from the real clock instead of being predicted.
+        cache = self._date_cache
+        if cache is not None and cache[0] == offset and cache[1] <= ts < cache[2]:
+            return cache[3]
+
+        date_str = now.strftime("%a, %b %d, %Y")
+        midnight = ts - (ts + offset) % 86400
+        self._date_cache = (offset, midnight, midnight + 86400, date_str)
+        return date_str
+
+    def set_locale(self, name):
+        """Switches the locale used for day/month names and drops the cached date."""
+        locale.setlocale(locale.LC_TIME, name)
+        self._date_cache = None
 
     def get_format_status(self):
         """Returns a string indicating the current format."""
@@ -200,11 +404,180 @@ class ClockModel:
         """Returns the display names of the available timezones."""
         return list(self.COMMON_TIMEZONES.keys())
 
+    # --- World Clock ---
+
+    def _get_world_clock(self):
+        if self._world_clock is None:
+            self._world_clock = WorldClock()
+        return self._world_clock
+
+    def get_world_zone_labels(self):
+        """Returns the city names shown on the World tab, in display order."""
+        return self._get_world_clock().get_zone_labels()
+
+    def get_world_times(self):
+        """Returns (time, abbreviation, day marker) for every world zone at this tick's instant."""
+        return self._get_world_clock().compute(self.get_now().timestamp(), self._is_24_hour_format)
+
+    def search_timezones(self, query, limit=50):
+        """
+        Returns display keys and IANA zones matching the typed text. The full
+        catalog is only built the first time someone searches.
+        """
+        return tz_catalog.get_catalog(self.COMMON_TIMEZONES).search(query, limit)
+
     def get_selected_timezone_key(self):
         """Returns the display name of the currently selected timezone."""
         return self._selected_timezone_key
 
     def set_timezone(self, tz_key):
-        """Sets the new timezone based on the display key."""
+        """Sets the new timezone from a display key or any IANA zone name."""
+        if tz_key in self.COMMON_TIMEZONES:
+            zone = self.COMMON_TIMEZONES[tz_key]
+        else:
+            catalog = tz_catalog.get_catalog(self.COMMON_TIMEZONES)
+            if tz_key not in catalog:
+                return False
+            zone = catalog.resolve(tz_key)
         self._selected_timezone_key = tz_key
-        self._selected_timezone = self.COMMON_TIMEZONES.get(tz_key)
\ No newline at end of file
+        self._selected_timezone = zone
+        try:
+            self._tzinfo = pytz.timezone(self._selected_timezone) if self._selected_timezone else None
+        except pytz.exceptions.UnknownTimeZoneError:
+            self._tzinfo = None
+        # The old snapshot and cached date belong to the previous zone
+        self._now = None
+        self._date_cache = None
+        # Alarms without their own zone ring at HH:MM of the displayed zone
+        self._alarms.set_display_timezone(self._selected_timezone, time.time())
+        if self._journal is not None:
+            self._journal.append({"op": "timezone", "key": tz_key})
+            # Every re-targeted alarm in one record, however many there are
+            self._journal_alarms([alarm.alarm_id for alarm in self._alarms.list() if alarm.tz_name is None])
+        return True
+
+    # --- Persistence ---
+
+    def attach_journal(self, journal):
+        """
+        Restores alarms and timers from the journal, then logs every later change
+        to it. Returns (missed alarms, expired timers): what came due while the
+        app was not running, as the journal's plain dicts (timer id None is the
+        Timer tab countdown).
+        """
+        state = journal.load()
+        now_ts = time.time()
+        missed_alarms = []
+        expired_timers = []
+
+        if state["timezone"] is not None:
+            self.set_timezone(state["timezone"])
+
+        repeated_alarms = []
+        for record in state["alarms"].values():
+            rule = Rule.from_dict(record["repeat"]) if record.get("repeat") else None
+            if record["fire_ts"] > now_ts:
+                date = datetime.date.fromisoformat(record["date"]) if record.get("date") else None
+                self._alarms.add(record["hour"], record["minute"], now_ts, record["tz"], record["id"],
+                                 record["fire_ts"], rule, date)
+                continue
+            missed_alarms.append(record)
+            if rule is not None:
+                # Still repeats: skip to its next occurrence after now
+                self._alarms.add(record["hour"], record["minute"], max(record["fire_ts"] + 60, now_ts),
+                                 record["tz"], record["id"], rule=rule)
+                repeated_alarms.append(record["id"])
+        main_alarm = self._alarms.get(state["main_alarm"])
+        if main_alarm is not None:
+            self._alarm_id = main_alarm.alarm_id
+            self._alarm_time = datetime.time(main_alarm.hour, main_alarm.minute)
+            self._alarm_set = True
+
+        # Running timers were journaled with wall-clock deadlines
+        for record in state["timers"].values():
+            remaining = record["remaining"]
+            if record["deadline"] is not None:
+                remaining = record["deadline"] - now_ts
+                if remaining <= 0:
+                    expired_timers.append(record)
+                    continue
+            timer_id = self.timers.create(record["total"], record["id"], remaining)
+            if record["deadline"] is not None:
+                self.timers.start(timer_id)
+
+        main_timer = state["main_timer"]
+        if main_timer is not None:
+            self._timer_total_seconds = main_timer["total"]
+            self._timer_remaining_seconds = main_timer["remaining"]
+            self._timer_finished = main_timer["finished"]
+            if main_timer["deadline"] is not None:
+                remaining = main_timer["deadline"] - now_ts
+                if remaining > 0:
+                    self._timer_deadline = self._clock() + remaining
+                    self._timer_running = True
+                else:
+                    self._timer_remaining_seconds = 0
+                    self._timer_finished = True
+                    expired_timers.append(dict(main_timer, id=None))
+
+        self._journal = journal
+        self.timers.on_change = self._journal_timer
+        for record in missed_alarms:
+            if record["id"] in repeated_alarms:
+                self._journal_alarm(record["id"])
+            else:
+                journal.append({"op": "alarm_remove", "id": record["id"]})
+        for record in expired_timers:
+            if record["id"] is None:
+                self._journal_main_timer()
+            else:
+                journal.append({"op": "timer_remove", "id": record["id"]})
+        return missed_alarms, expired_timers
+
+    def close_journal(self):
+        """Flushes and closes the journal; later changes are no longer persisted."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self.timers.on_change = None
+
+    def _wall_time(self, monotonic_ts):
+        return time.time() + (monotonic_ts - self._clock())
+
+    def _journal_alarm(self, alarm_id):
+        if self._journal is None:
+            return
+        alarm = self._alarms.get(alarm_id)
+        if alarm is None:
+            self._journal.append({"op": "alarm_remove", "id": alarm_id})
+        else:
+            self._journal.append(dict(self._alarm_record(alarm), op="alarm"))
+
+    def _journal_alarms(self, alarm_ids):
+        # One "alarms" record for a whole batch of existing alarms
+        if self._journal is not None and alarm_ids:
+            self._journal.append({"op": "alarms", "alarms": [
+                self._alarm_record(self._alarms.get(alarm_id)) for alarm_id in alarm_ids]})
+
+    @staticmethod
+    def _alarm_record(alarm):
+        return {"id": alarm.alarm_id, "hour": alarm.hour, "minute": alarm.minute, "tz": alarm.tz_name,
+                "fire_ts": alarm.fire_ts, "repeat": None if alarm.rule is None else alarm.rule.to_dict(),
+                "date": None if alarm.date is None else alarm.date.isoformat()}
+
+    def _journal_timer(self, timer_id):
+        if timer_id not in self.timers or self.timers.is_finished(timer_id):
+            self._journal.append({"op": "timer_remove", "id": timer_id})
+        else:
+            deadline = self.timers.get_deadline(timer_id)
+            self._journal.append({"op": "timer", "id": timer_id, "total": self.timers.get_total(timer_id),
+                                  "remaining": self.timers.get_remaining(timer_id),
+                                  "deadline": None if deadline is None else self._wall_time(deadline)})
+
+    def _journal_main_timer(self):
+        if self._journal is None:
+            return
+        self._journal.append({"op": "main_timer", "total": self._timer_total_seconds,
+                              "remaining": self._timer_remaining_seconds,
+                              "deadline": None if self._timer_deadline is None else self._wall_time(self._timer_deadline),
+                              "finished": self._timer_finished})
\ No newline at end of file
@@ -0,0 +1,179 @@
+# recurrence.py
+# Repeat rules for alarms ("weekdays", "mon,wed,fri", "every 3 days", ...).
+#
+# A rule is compiled once into a day-offset table, so finding the next
+# occurrence is two table lookups and at most two local-time conversions, never
+# a scan. Wall times are resolved in the alarm's zone: a time that falls into a
+# DST gap fires the same distance after the gap (02:30 -> 03:30), and a time
+# that happens twice in an overlap fires on the first pass only - unless the
+# alarm is set, or last fired, when that pass is already over, in which case it
+# rings on the second.
+import datetime
+
+import pytz
+
+from validation import InputError
+
+MAX_INTERVAL = 3660  # Days; about ten years, far inside the range datetime.date can count to
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DAY_FULL_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+NAMED_SETS = {
+    "daily": range(7),
+    "weekdays": range(5),
+    "weekends": (5, 6),
+}
+
+
+def local_instants(day, hour, minute, tz):
+    """
+    Returns (first, second): the UNIX times of HH:MM on 'day' in tz (None =
+    the system zone). They differ only in an overlap, where the wall time
+    happens twice. Gap: both are shifted forward by the gap's length.
+    """
+    naive = datetime.datetime.combine(day, datetime.time(hour, minute))
+    if tz is None:
+        # fold=0 is the first pass of an overlap and is pushed past a gap;
+        # fold=1 is only later than it in an overlap
+        first = naive.timestamp()
+        return first, max(first, naive.replace(fold=1).timestamp())
+    try:
+        ts = tz.localize(naive, is_dst=None).timestamp()
+        return ts, ts
+    except pytz.exceptions.AmbiguousTimeError:
+        passes = (tz.localize(naive, is_dst=True).timestamp(), tz.localize(naive, is_dst=False).timestamp())
+        return min(passes), max(passes)
+    except pytz.exceptions.NonExistentTimeError:
+        # Read with the offset in force before the gap, i.e. pushed past it
+        ts = tz.localize(naive, is_dst=False).timestamp()
+        return ts, ts
+
+
+def local_timestamp(day, hour, minute, tz):
+    """
+    Returns the UNIX time of HH:MM on 'day' in tz (None = the system zone).
+    Gap: shifted forward by the gap's length. Overlap: the earlier instant.
+    """
+    return local_instants(day, hour, minute, tz)[0]
+
+
+class Rule:
+    """
+    A compiled repeat rule: either a set of weekdays (0 = Monday) or every
+    'interval' days counted from 'start' (a date). days_until() is O(1).
+    """
+
+    def __init__(self, weekdays=None, interval=None, start=None):
+        if interval is not None:
+            if not 1 <= interval <= MAX_INTERVAL:
+                raise ValueError(f"interval must be 1 to {MAX_INTERVAL} days")
+            self.weekdays = None
+            self.interval = interval
+            self.start = start or datetime.date.today()
+            self._start_ordinal = self.start.toordinal()
+            self._skip = None
+        else:
+            self.weekdays = frozenset(weekdays)
+            if not self.weekdays or not self.weekdays <= set(range(7)):
+                raise ValueError("weekdays must be a non-empty set of 0..6")
+            self.interval = None
+            self.start = None
+            # _skip[w]: days from weekday w to the next allowed weekday (0 if w itself is allowed)
+            self._skip = tuple(next(n for n in range(7) if (w + n) % 7 in self.weekdays) for w in range(7))
+
+    def days_until(self, day):
+        """Days from 'day' to the first date on or after it (and on or after start) that the rule allows."""
+        if self._skip is not None:
+            return self._skip[day.weekday()]
+        # Nothing fires before the start date
+        ordinal = max(day.toordinal(), self._start_ordinal)
+        return ordinal - day.toordinal() + (self._start_ordinal - ordinal) % self.interval
+
+    def next_fire_ts(self, hour, minute, tz_name, now_ts, fired_ts=None):
+        """
+        Returns the UNIX time of the next HH:MM occurrence in tz_name (None =
+        local time). Like one-shot alarms, the minute in progress still counts.
+        fired_ts is when the alarm last rang: if that was the first pass of an
+        overlap, the second pass is skipped. Raises InputError (a ValueError) if
+        the occurrence is past the last date datetime can represent.
+        """
+        tz = pytz.timezone(tz_name) if tz_name else None
+        today = datetime.datetime.fromtimestamp(now_ts, tz).date()
+        try:
+            day = today + datetime.timedelta(days=self.days_until(today))
+            first, second = local_instants(day, hour, minute, tz)
+            if first + 60 > now_ts:
+                return first
+            if second + 60 > now_ts and (fired_ts is None or fired_ts < first):
+                return second
+            day += datetime.timedelta(days=1)
+            day += datetime.timedelta(days=self.days_until(day))
+            return local_timestamp(day, hour, minute, tz)
+        except (OverflowError, ValueError):
+            raise InputError("Invalid Repeat", f"'{self.describe()}' has no next occurrence.", "repeat")
+
+    def describe(self):
+        """Short text for the UI; parse_rule() reads it back."""
+        if self.interval is not None:
+            unit = "day" if self.interval == 1 else "days"
+            return f"every {self.interval} {unit} from {self.start.isoformat()}"
+        for name, days in NAMED_SETS.items():
+            if self.weekdays == frozenset(days):
+                return name
+        return ",".join(DAY_NAMES[w] for w in sorted(self.weekdays))
+
+    def to_dict(self):
+        if self.interval is not None:
+            return {"every": self.interval, "from": self.start.isoformat()}
+        return {"days": sorted(self.weekdays)}
+
+    @classmethod
+    def from_dict(cls, data):
+        if "every" in data:
+            return cls(interval=data["every"], start=datetime.date.fromisoformat(data["from"]))
+        return cls(weekdays=data["days"])
+
+
+def _parse_day(text):
+    for index, name in enumerate(DAY_FULL_NAMES):
+        if len(text) >= 3 and name.startswith(text):
+            return index
+    raise InputError("Invalid Repeat", f"Unknown day '{text}'.", "repeat")
+
+
+def parse_rule(text, today=None):
+    """
+    Parses repeat text and returns a Rule, or None for a one-shot alarm ("" or
+    "once"). Accepts daily, weekdays, weekends, day lists and ranges
+    ("mon,wed,fri", "mon-thu"), "weekly fri" and "every 3 days [from
+    2024-05-01]" (counted from today without 'from').
+    """
+    text = " ".join(text.strip().lower().split())
+    if text in ("", "once"):
+        return None
+    if text in NAMED_SETS:
+        return Rule(weekdays=NAMED_SETS[text])
+    if text.startswith("weekly "):
+        text = text[len("weekly "):]
+    elif text.startswith("every "):
+        words = text.split(" ")
+        if words[1:] == ["day"]:
+            return Rule(weekdays=NAMED_SETS["daily"])
+        if len(words) in (3, 5) and words[1].isdecimal() and words[1].isascii() and words[2] in ("day", "days") \
+                and (len(words) == 3 or words[3] == "from"):
+            interval = int(words[1])
+            if not 1 <= interval <= MAX_INTERVAL:
+                raise InputError("Invalid Repeat", f"Repeat every 1 to {MAX_INTERVAL} days.", "repeat")
+            try:
+                start = datetime.date.fromisoformat(words[4]) if len(words) == 5 else today
+            except ValueError:
+                raise InputError("Invalid Repeat", f"Expected a YYYY-MM-DD date, got '{words[4]}'.", "repeat")
+            return Rule(interval=interval, start=start)
+        text = " ".join(words[1:])  # "every mon" is weekly
+
+    weekdays = set()
+    for part in text.replace(" ", "").split(","):
+        first, _, last = part.partition("-")
+        first = _parse_day(first)
+        last = _parse_day(last) if last else first
+        weekdays.update((first + n) % 7 for n in range((last - first) % 7 + 1))
+    return Rule(weekdays=weekdays)
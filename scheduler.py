@@ -0,0 +1,114 @@
+# scheduler.py
+import math
+import time
+
+# Bounds on one sleep of an event-driven loop (headless.py, async_runtime.py):
+# the upper one so wall-clock adjustments (NTP, suspend) are noticed, the lower
+# one so a wake-up a hair before a deadline cannot spin
+MAX_SLEEP = 60.0
+MIN_SLEEP = 0.001
+
+
+def clamp_sleep(seconds):
+    """Bounds a wait until the next deadline (None = nothing pending) to [MIN_SLEEP, MAX_SLEEP]."""
+    return MAX_SLEEP if seconds is None else min(max(seconds, MIN_SLEEP), MAX_SLEEP)
+
+
+class TickScheduler:
+    """
+    Works out how long to wait before the next clock tick so that each tick
+    lands just after a wall-clock second boundary.
+
+    The wall clock is only sampled to find where the boundaries are; all of the
+    waiting and lateness measurements use time.monotonic(), so NTP steps or a
+    user changing the system time never produce negative or huge delays.
+    """
+
+    COALESCE = "coalesce"
+    CATCH_UP = "catch_up"
+
+    def __init__(self, period=1.0, policy=COALESCE, guard_ms=1, max_catch_up=5,
+                 clock=time.monotonic, wall_clock=time.time):
+        self.period = period
+        self.policy = policy
+        self.guard_ms = guard_ms          # Land this far past the boundary, never before it
+        self.max_catch_up = max_catch_up  # Upper bound on back-to-back catch-up ticks
+        self._clock = clock
+        self._wall_clock = wall_clock
+
+        self._target = None        # Monotonic instant the pending tick is aimed at
+        self._tick_start = None
+        self._pending_catch_up = 0
+
+        # --- Counters ---
+        self.ticks = 0
+        self.missed = 0            # Boundaries that passed without a tick of their own
+        self.caught_up = 0         # Missed boundaries replayed (CATCH_UP policy)
+        self.overruns = 0          # Ticks whose own work took longer than one period
+        self.last_jitter_ms = 0.0
+        self.max_jitter_ms = 0.0
+        self._jitter_total_ms = 0.0
+
+    def _next_boundary(self, now):
+        """Returns the monotonic instant of the next wall-clock period boundary after 'now'."""
+        wall = self._wall_clock()
+        offset = wall - now
+        next_wall = (math.floor(wall / self.period) + 1) * self.period
+        return next_wall - offset
+
+    def tick_started(self):
+        """Records how late the current tick is. Call first thing in the tick callback."""
+        now = self._clock()
+        self._tick_start = now
+        self.ticks += 1
+
+        if self._target is None:
+            return
+
+        lateness = now - self._target
+        jitter_ms = lateness * 1000.0
+        self.last_jitter_ms = jitter_ms
+        self.max_jitter_ms = max(self.max_jitter_ms, abs(jitter_ms))
+        self._jitter_total_ms += abs(jitter_ms)
+
+        # Every whole period we are late by is a boundary that never got its own tick.
+        skipped = int(lateness // self.period) if lateness > 0 else 0
+        if skipped:
+            self.missed += skipped
+            if self.policy == self.CATCH_UP:
+                self._pending_catch_up = min(self._pending_catch_up + skipped, self.max_catch_up)
+
+    def next_delay_ms(self):
+        """Returns the delay in ms for view.after() so the next tick hits the next boundary."""
+        now = self._clock()
+
+        if self._tick_start is not None and now - self._tick_start > self.period:
+            self.overruns += 1
+
+        if self._pending_catch_up:
+            # Replay a missed tick straight away; the boundary target stays where it is.
+            self._pending_catch_up -= 1
+            self.caught_up += 1
+            self._target = now
+            return 0
+
+        self._target = self._next_boundary(now)
+        delay_ms = math.ceil((self._target - now) * 1000.0) + self.guard_ms
+        return max(delay_ms, 0)
+
+    def get_stats(self):
+        """Returns the jitter/overrun counters as a dict (for logging or a debug panel)."""
+        return {
+            "ticks": self.ticks,
+            "missed": self.missed,
+            "caught_up": self.caught_up,
+            "overruns": self.overruns,
+            "last_jitter_ms": round(self.last_jitter_ms, 3),
+            "max_jitter_ms": round(self.max_jitter_ms, 3),
+            "mean_jitter_ms": round(self._jitter_total_ms / max(self.ticks - 1, 1), 3),
+        }
+
+    def reset_stats(self):
+        """Clears the counters without touching the current schedule."""
+        self.ticks = self.missed = self.caught_up = self.overruns = 0
+        self.last_jitter_ms = self.max_jitter_ms = self._jitter_total_ms = 0.0
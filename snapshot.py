@@ -0,0 +1,36 @@
+# snapshot.py
+import collections
+import enum
+
+
+class AlarmState(enum.Enum):
+    OFF = "off"
+    SET = "set"
+    TRIGGERED = "triggered"
+
+
+class TimerState(enum.Enum):
+    # Values double as the status text shown on the Timer tab
+    OFF = "OFF"
+    READY = "READY"
+    RUNNING = "RUNNING"
+    FINISHED = "TIMER FINISHED!"
+
+
+_SnapshotFields = collections.namedtuple("_SnapshotFields", (
+    "time_str", "date_str", "format_status", "tz_key",
+    "alarm_state", "alarm_status",
+    "timer_state", "timer_str", "timer_status",
+    "world_times",
+), defaults=(None,))
+
+
+class ClockSnapshot(_SnapshotFields):
+    """
+    Everything the view needs for one tick, produced by ClockModel.snapshot().
+    A slotted tuple: immutable, no per-instance dict, cheaper to build than the
+    old string-keyed dict, and frames branch on the enum states instead of
+    searching the status strings.
+    """
+
+    __slots__ = ()
@@ -1,26 +1,34 @@
 
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
+import image_cache
+from animation import AnimationScheduler, Tween, ease_out_cubic
+from gif_player import GifPlayer
 
 class SplashScreen(tk.Toplevel):
-    def __init__(self, parent, duration=3000, image_path=None):
+    """
+    Shown while main.py warms the app up. It has no timer of its own: main.py
+    reports each completed stage through update_progress() and destroys the
+    splash when the last one is done.
+    """
+
+    def __init__(self, parent, image_path=None):
         super().__init__(parent)
-        self.duration = duration
         self.overrideredirect(True)
         self.configure(bg="#2b2b2b")
         self.geometry("400x250+500+300")
         self.progress_value = 0.0
 
-        # Icon Image
+        # Icon Image: the cached first frame paints at once, the animation follows
         self.icon_label = None
+        self.player = None
         if image_path:
             try:
-                img = Image.open(image_path)
-                img = img.resize((400, 240), Image.LANCZOS)
-                self.photo = ImageTk.PhotoImage(img)
+                # Resized once, then loaded from the cache as PNG (no PIL import)
+                self.photo = image_cache.load_photo(self, image_path, (400, 240))
                 self.icon_label = tk.Label(self, image=self.photo, bg="#2b2b2b")
                 self.icon_label.pack(pady=10)
+                self.player = GifPlayer(self.icon_label, image_path, (400, 240))
             except Exception as e:
                 print("Splash image could not load:", e)
 
@@ -38,62 +46,56 @@ class SplashScreen(tk.Toplevel):
                                       fg="#00ff00", bg="#2b2b2b")
         self.percent_label.pack()
 
+        # Current warm-up stage
+        self.stage_label = tk.Label(self, text="", font=("Helvetica", 10),
+                                    fg="#aaaaaa", bg="#2b2b2b")
+        self.stage_label.pack()
+
         # Progress parameters
         self.max_steps = 100
-        self.step_duration = self.duration / self.max_steps
-        self.increment = 0.5
+        self.progress_slide = 0.25  # seconds for the bar to reach a new stage
+
+        # Every animation (fade, progress bar, GIF) advances in one callback per frame
+        self.animations = AnimationScheduler(self)
 
         # Fade-in
         self.attributes("-alpha", 0.0)
-        self.fade_in_step = 0.02
-        self.after(0, self.fade_in)
-
-        # Bounce parameters
-        self.bounce_direction = 1
-        self.bounce_max = 10  # pixels
-        self.bounce_speed = 3  # pixels per frame
+        self.fade_in_duration = 1.5  # seconds
+        self.animations.add("fade", Tween(0.0, 1.0, self.fade_in_duration, self.set_alpha))
 
         # Start updates
-        self.after(10, self.update_progress)
-        if self.icon_label:
-            self.after(10, self.bounce_icon)
-
-    def fade_in(self):
-        alpha = self.attributes("-alpha")
-        if alpha < 1.0:
-            alpha = min(alpha + self.fade_in_step, 1.0)
-            self.attributes("-alpha", alpha)
-            self.after(30, self.fade_in)
-
-    def update_progress(self):
-        if self.progress_value < self.max_steps:
-            self.progress_value += self.increment
-            if self.progress_value > self.max_steps:
-                self.progress_value = self.max_steps
-
-            # Update progress bar width
-            bar_width = (self.progress_value / self.max_steps) * 300
-            self.canvas.coords(self.progress_rect, 0, 0, bar_width, 20)
-
-            # Dynamic gradient color
-            green = max(0, 255 - int(self.progress_value * 2.5))
-            red = min(255, int(self.progress_value * 2.5))
-            color = f'#{red:02x}{green:02x}00'
-            self.canvas.itemconfig(self.progress_rect, fill=color)
-            self.percent_label.config(text=f"{int(self.progress_value)}%", fg=color)
-
-            self.after(int(self.step_duration / self.increment), self.update_progress)
-        else:
-            self.destroy()
-
-    def bounce_icon(self):
-        if self.icon_label:
-            # Get current y-position
-            y = self.icon_label.winfo_y()
-            # Move up/down
-            if y <= 10:
-                self.bounce_direction = 1
-            elif y >= 10 + self.bounce_max:
-                self.bounce_direction = -1
-            self.icon_label.place_configure(y=y + self.bounce_direction * self.bounce_speed)
-            self.after(50, self.bounce_icon)
+        if self.player:
+            self.player.start()
+            self.animations.add("gif", self.player)
+
+    def destroy(self):
+        # The splash may close mid-animation; drop the frame callback before the widgets go
+        self.animations.stop()
+        if self.player:
+            self.player.stop()
+        super().destroy()
+
+    def set_alpha(self, alpha):
+        self.attributes("-alpha", alpha)
+
+    def update_progress(self, completed, total, stage_text=""):
+        """Shows 'completed' of 'total' warm-up stages and the name of the one running now."""
+        self.stage_label.config(text=stage_text)
+        # Slide from wherever the bar is now to the new value
+        target = completed / total * self.max_steps
+        self.animations.add("progress", Tween(self.progress_value, target, self.progress_slide,
+                                              self.draw_progress, ease_out_cubic))
+
+    def draw_progress(self, value):
+        self.progress_value = value
+
+        # Update progress bar width
+        bar_width = (self.progress_value / self.max_steps) * 300
+        self.canvas.coords(self.progress_rect, 0, 0, bar_width, 20)
+
+        # Dynamic gradient color
+        green = max(0, 255 - int(self.progress_value * 2.5))
+        red = min(255, int(self.progress_value * 2.5))
+        color = f'#{red:02x}{green:02x}00'
+        self.canvas.itemconfig(self.progress_rect, fill=color)
+        self.percent_label.config(text=f"{int(self.progress_value)}%", fg=color)
@@ -0,0 +1,103 @@
+# test_alarm_import.py
+import datetime
+
+from alarm_import import ImportReport, _split_date_time, csv_rows, ics_rows, import_alarms, valid_alarms
+from models import ClockModel
+
+NOW = datetime.datetime(2030, 1, 1, 8, 30, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def _valid(rows, display_tz_name=None):
+    report = ImportReport()
+    return list(valid_alarms(rows, report, display_tz_name, NOW)), report
+
+
+def test_split_date_time():
+    assert _split_date_time("07:30") == ("07:30", None)
+    assert _split_date_time(" 7:30:15 ") == ("7:30", None)
+    assert _split_date_time("2030-05-01 07:30") == ("07:30", "2030-05-01")
+    assert _split_date_time("2030-05-01T07:30:00") == ("07:30", "2030-05-01")
+    assert _split_date_time("") == ("", None)
+
+
+def test_csv_header_names_the_columns():
+    lines = ["Zone,Start Time,Date\r\n",
+             "Europe/Berlin,07:30,2030-05-01\r\n",
+             "\r\n",
+             ",2030-06-01 08:00,\r\n",
+             "UTC,9:15:00,\r\n"]
+    assert list(csv_rows(lines)) == [(2, "07:30", "Europe/Berlin", "2030-05-01"),
+                                     (4, "08:00", None, "2030-06-01"),
+                                     (5, "9:15", "UTC", None)]
+
+
+def test_csv_without_header_reads_the_first_column():
+    assert list(csv_rows(["07:30,ignored\n", "2030-05-01T08:00:00\n"])) == [
+        (1, "07:30", None, None), (2, "08:00", None, "2030-05-01")]
+
+
+def test_ics_rows():
+    lines = ["BEGIN:VCALENDAR\r\n",
+             "DTSTART:20300101T060000Z\r\n",  # Outside any event
+             "BEGIN:VEVENT\r\n",
+             "DTSTART;TZID=\"America/New_York\":2030050\r\n",
+             " 1T073000\r\n",  # Folded continuation line
+             "END:VEVENT\r\n",
+             "BEGIN:VEVENT\r\n",
+             "DTSTART:20300501T120000Z\r\n",
+             "END:VEVENT\r\n",
+             "BEGIN:VEVENT\r\n",
+             "DTSTART:20300501T090000\r\n",
+             "END:VEVENT\r\n",
+             "BEGIN:VEVENT\r\n",
+             "DTSTART;VALUE=DATE:20300106\r\n",
+             "END:VEVENT\r\n",
+             "END:VCALENDAR\r\n"]
+    assert list(ics_rows(lines)) == [(4, "07:30", "America/New_York", "2030-05-01"),
+                                     (8, "12:00", "UTC", "2030-05-01"),
+                                     (11, "09:00", None, "2030-05-01"),
+                                     (14, None, None, None)]
+
+
+def test_bad_rows_go_to_the_report():
+    rows = [(2, "07:30", None, None),
+            (3, "25:00", None, None),
+            (4, "0²:30", None, None),
+            (5, "07:30", "Mars/Olympus", None),
+            (6, None, None, None),
+            (7, "07:30", None, "2030-13-01"),
+            (8, "07:30", "UTC", "2029-12-31"),
+            (9, "08:30", "UTC", "2030-01-01"),  # The minute in progress still counts
+            (10, "07:30", "Europe/Berlin", "2030-01-02")]
+    alarms, report = _valid(rows)
+    assert alarms == [(7, 30, None, None), (8, 30, "UTC", datetime.date(2030, 1, 1)),
+                      (7, 30, "Europe/Berlin", datetime.date(2030, 1, 2))]
+    assert report.rows == 9
+    assert [line_no for line_no, _ in report.errors] == [3, 4, 5, 6, 7, 8]
+    messages = dict(report.errors)
+    assert messages[5] == "Unknown timezone 'Mars/Olympus'."
+    assert messages[6] == "All-day events have no alarm time."
+    assert messages[8] == "2029-12-31 07:30 has already passed."
+
+
+def test_floating_dated_rows_use_the_display_zone():
+    # 08:00 on 2030-01-01 has passed in Tokyo (23:00 UTC the day before) but not in New York
+    rows = [(1, "08:00", None, "2030-01-01")]
+    assert _valid(rows, "Asia/Tokyo")[0] == []
+    assert _valid(rows, "America/New_York")[0] == [(8, 0, None, datetime.date(2030, 1, 1))]
+
+
+def test_import_alarms_in_batches(tmp_path):
+    path = tmp_path / "shifts.csv"
+    path.write_text("time,tz\n07:30,\n2035-05-01 08:00,Europe/Berlin\nnope,\n2000-01-01 09:00,\n10:45,UTC\n",
+                    encoding="utf-8")
+    model = ClockModel()
+    report = import_alarms(model, str(path), batch_size=2, max_errors=1)
+
+    assert (report.rows, report.imported, report.error_count) == (5, 3, 2)
+    assert report.errors == [(4, "Expected HH:MM, got 'nope'.")]
+    alarms = {alarm["time"]: alarm for alarm in model.list_alarms()}
+    assert sorted(alarms) == ["07:30", "08:00", "10:45"]
+    assert alarms["08:00"]["date"] == "2035-05-01"
+    assert alarms["08:00"]["fire_ts"] == datetime.datetime(2035, 5, 1, 6, 0, tzinfo=datetime.timezone.utc).timestamp()
+    assert alarms["10:45"]["date"] is None
@@ -0,0 +1,95 @@
+# test_journal.py
+import datetime
+import json
+import time
+
+import pytest
+
+from journal import JOURNAL_NAME, Journal, JournalLockedError
+from models import ClockModel
+
+
+def _alarm(alarm_id, fire_ts=2e9):
+    return {"op": "alarm", "id": alarm_id, "hour": 7, "minute": 30, "tz": None, "fire_ts": fire_ts}
+
+
+def test_torn_tail_is_dropped_and_overwritten(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.load()
+    journal.append(_alarm(1))
+    journal.append(_alarm(2))
+    journal.close()
+
+    # A crash in the middle of writing the third record
+    with open(tmp_path / JOURNAL_NAME, "ab") as f:
+        f.write(json.dumps(_alarm(3)).encode("utf-8")[:20])
+
+    journal = Journal(str(tmp_path))
+    state = journal.load()
+    assert sorted(state["alarms"]) == ["1", "2"]
+    journal.append(_alarm(4))
+    journal.close()
+
+    state = Journal(str(tmp_path)).load()
+    assert sorted(state["alarms"]) == ["1", "2", "4"]
+    with open(tmp_path / JOURNAL_NAME, "rb") as f:
+        assert all(json.loads(line) for line in f)
+
+
+def test_bad_record_stops_replay(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.load()
+    journal.append(_alarm(1))
+    journal.close()
+    with open(tmp_path / JOURNAL_NAME, "ab") as f:
+        f.write(b"{not json}\n")
+        f.write(json.dumps(_alarm(2)).encode("utf-8") + b"\n")
+
+    assert sorted(Journal(str(tmp_path)).load()["alarms"]) == ["1"]
+
+
+def test_replay_over_snapshot_is_idempotent(tmp_path):
+    journal = Journal(str(tmp_path), compact_after=3)
+    journal.load()
+    for alarm_id in range(1, 6):
+        journal.append(_alarm(alarm_id))
+    journal.append({"op": "alarm_remove", "id": 2})
+    snapshot_state = json.loads(json.dumps(journal.state))
+    journal.close()
+
+    # Simulate a crash between writing the snapshot and truncating the journal
+    with open(tmp_path / JOURNAL_NAME, "ab") as f:
+        f.write(json.dumps(_alarm(3)).encode("utf-8") + b"\n")
+        f.write(json.dumps({"op": "alarm_remove", "id": 2}).encode("utf-8") + b"\n")
+
+    assert Journal(str(tmp_path)).load()["alarms"] == snapshot_state["alarms"]
+
+
+def test_second_process_is_refused(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.load()
+    with pytest.raises(JournalLockedError):
+        Journal(str(tmp_path)).load()
+    journal.close()
+    Journal(str(tmp_path)).load()
+
+
+def test_model_restore_reports_missed_alarms(tmp_path):
+    # Hours from now, so no alarm is in its minute whenever the test runs
+    later = [datetime.datetime.now() + datetime.timedelta(hours=hours) for hours in (2, 3, 4)]
+    model = ClockModel()
+    model.attach_journal(Journal(str(tmp_path)))
+    kept = model.add_alarm(later[0].hour, later[0].minute)
+    missed = model.add_alarm(later[1].hour, later[1].minute)
+    model.set_alarm(later[2].hour, later[2].minute)
+    model._alarms.get(missed).fire_ts = time.time() - 3600
+    model._journal_alarm(missed)
+    model.close_journal()
+
+    restored = ClockModel()
+    missed_alarms, expired_timers = restored.attach_journal(Journal(str(tmp_path)))
+    assert [record["id"] for record in missed_alarms] == [missed]
+    assert expired_timers == []
+    assert sorted(alarm["id"] for alarm in restored.list_alarms()) == [kept, missed + 1]
+    assert restored.get_alarm_status().startswith(f"ALARM SET: {later[2]:%H:%M}")
+    restored.close_journal()
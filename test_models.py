@@ -0,0 +1,64 @@
+# test_models.py
+import datetime
+import random
+
+import pytest
+import pytz
+
+from models import ClockModel
+from recurrence import Rule
+from snapshot import AlarmState
+
+ZONES = ["America/New_York", "America/Sao_Paulo", "Asia/Beirut", "Pacific/Apia",
+         "Australia/Lord_Howe", "America/Havana", "Asia/Kolkata", None]
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_cached_date_string_matches_strftime(zone):
+    model = ClockModel()
+    if zone is not None:
+        assert model.set_timezone(zone)
+    tz = pytz.timezone(zone) if zone else None
+    rng = random.Random(zone)
+    start = datetime.datetime(2010, 1, 1, tzinfo=pytz.utc).timestamp()
+    end = datetime.datetime(2012, 12, 31, tzinfo=pytz.utc).timestamp()
+
+    ts = start
+    while ts < end:
+        # Mostly small steps (the cache is hit and crosses midnights and DST
+        # changes in order), sometimes a jump anywhere in the range
+        ts = rng.uniform(start, end) if rng.random() < 0.05 else ts + rng.choice((1, 60, 1800, 3600, 7200, 21600))
+        model._now = datetime.datetime.fromtimestamp(ts, tz)
+        assert model.get_date_string() == model._now.strftime("%a, %b %d, %Y")
+
+
+def test_extra_alarm_does_not_trigger_alarm_tab():
+    # The extra alarm comes first, whenever the test runs
+    extra_at, main_at = (datetime.datetime.now() + datetime.timedelta(hours=hours) for hours in (2, 3))
+    model = ClockModel()
+    model.set_alarm(main_at.hour, main_at.minute)
+    main = model._alarms.get(model._alarm_id)
+    extra = model.add_alarm(extra_at.hour, extra_at.minute)
+    model.check_alarm(datetime.datetime.fromtimestamp(model._alarms.get(extra).fire_ts))
+
+    assert [alarm.alarm_id for alarm in model.pop_fired_alarms()] == [extra]
+    assert model.get_just_triggered_status()
+    assert model.get_alarm_state() is not AlarmState.TRIGGERED
+    assert model.get_alarm_status().startswith(f"ALARM SET: {main_at:%H:%M}")
+
+    model.check_alarm(datetime.datetime.fromtimestamp(main.fire_ts))
+    assert model.get_alarm_state() is AlarmState.TRIGGERED
+
+
+def test_dismiss_keeps_a_repeating_alarm():
+    at = datetime.datetime.now() + datetime.timedelta(hours=2)
+    model = ClockModel()
+    model.set_alarm(at.hour, at.minute, Rule(weekdays=range(7)))
+    alarm = model._alarms.get(model._alarm_id)
+    model.check_alarm(datetime.datetime.fromtimestamp(alarm.fire_ts))
+    assert model.get_alarm_state() is AlarmState.TRIGGERED
+
+    model.dismiss_alarm()
+    assert model.get_alarm_state() is AlarmState.SET
+    assert model.get_alarm_status() == f"ALARM SET: {at:%H:%M} (daily)"
+    assert len(model.list_alarms()) == 1
@@ -0,0 +1,100 @@
+# test_recurrence.py
+import datetime
+
+import pytest
+
+from alarms import AlarmQueue, next_fire_timestamp
+from recurrence import Rule, parse_rule
+from validation import InputError
+
+DAILY = Rule(weekdays=range(7))
+
+
+def _utc(*args):
+    return datetime.datetime(*args, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def test_time_in_gap_fires_after_the_gap():
+    # Berlin springs forward 02:00 -> 03:00 CEST (01:00 UTC) on 2025-03-30
+    now_ts = _utc(2025, 3, 29, 23, 0)
+    assert DAILY.next_fire_ts(2, 30, "Europe/Berlin", now_ts) == _utc(2025, 3, 30, 1, 30)
+    assert next_fire_timestamp(2, 30, "Europe/Berlin", now_ts) == _utc(2025, 3, 30, 1, 30)
+
+
+def test_time_in_overlap_fires_on_first_pass_only():
+    # New York falls back 02:00 EDT -> 01:00 EST (06:00 UTC) on 2024-11-03
+    alarms = AlarmQueue()
+    alarm_id = alarms.add(1, 30, _utc(2024, 11, 3, 4, 0), "America/New_York", rule=DAILY)
+    assert alarms.get(alarm_id).fire_ts == _utc(2024, 11, 3, 5, 30)  # 01:30 EDT
+
+    assert alarms.pop_due(_utc(2024, 11, 3, 5, 30))[0].alarm_id == alarm_id
+    # Not again at 01:30 EST, but the next night
+    assert alarms.peek_fire_ts() == _utc(2024, 11, 4, 6, 30)
+    assert alarms.pop_due(_utc(2024, 11, 3, 6, 30)) == []
+
+
+def test_alarm_set_during_second_pass_fires_the_same_night():
+    # 01:10 EST, after the 01:30 EDT pass: 01:30 EST is still ahead
+    now_ts = _utc(2024, 11, 3, 6, 10)
+    assert DAILY.next_fire_ts(1, 30, "America/New_York", now_ts) == _utc(2024, 11, 3, 6, 30)
+    assert next_fire_timestamp(1, 30, "America/New_York", now_ts) == _utc(2024, 11, 3, 6, 30)
+
+    alarms = AlarmQueue()
+    alarms.add(1, 30, now_ts, "America/New_York", rule=DAILY)
+    assert alarms.peek_fire_ts() == _utc(2024, 11, 3, 6, 30)
+    alarms.pop_due(_utc(2024, 11, 3, 6, 30))
+    assert alarms.peek_fire_ts() == _utc(2024, 11, 4, 6, 30)
+
+
+@pytest.mark.parametrize("text", ["daily", "weekdays", "weekends", "mon,wed,fri", "tue",
+                                  "every 1 day from 2024-05-01", "every 3 days from 2024-05-01"])
+def test_describe_round_trips(text):
+    rule = parse_rule(text)
+    assert rule.describe() == text
+    assert parse_rule(rule.describe()).to_dict() == rule.to_dict()
+    assert Rule.from_dict(rule.to_dict()).describe() == text
+
+
+def test_parse_rule_forms():
+    assert parse_rule("once") is None
+    assert parse_rule("mon-thu").describe() == "mon,tue,wed,thu"
+    assert parse_rule("fri-mon").describe() == "mon,fri,sat,sun"
+    assert parse_rule("weekly fri").describe() == "fri"
+    assert parse_rule("every day").describe() == "daily"
+    assert parse_rule("every 2 days", today=datetime.date(2024, 5, 1)).describe() == "every 2 days from 2024-05-01"
+    for text in ("every 0 days", "every ² days", "every 5000000 days", "mon,funday", "every 3 days from May"):
+        with pytest.raises(InputError):
+            parse_rule(text)
+    with pytest.raises(ValueError):
+        Rule(interval=5_000_000)
+
+
+def test_occurrence_past_the_date_range_is_a_value_error():
+    rule = Rule(interval=3, start=datetime.date(9999, 12, 29))
+    with pytest.raises(ValueError):
+        rule.next_fire_ts(7, 30, "UTC", _utc(9999, 12, 31, 8, 0))
+
+
+def test_every_n_days_counts_from_start():
+    rule = Rule(interval=3, start=datetime.date(2024, 5, 1))
+    assert rule.next_fire_ts(7, 30, "UTC", _utc(2024, 5, 1, 7, 0)) == _utc(2024, 5, 1, 7, 30)
+    assert rule.next_fire_ts(7, 30, "UTC", _utc(2024, 5, 1, 8, 0)) == _utc(2024, 5, 4, 7, 30)
+    # Nothing fires before the start, however far away it is
+    assert rule.next_fire_ts(7, 30, "UTC", _utc(2024, 4, 30, 8, 0)) == _utc(2024, 5, 1, 7, 30)
+    later = parse_rule("every 7 days from 2026-12-01", today=datetime.date(2026, 10, 18))
+    assert later.next_fire_ts(7, 30, "UTC", _utc(2026, 10, 18, 8, 0)) == _utc(2026, 12, 1, 7, 30)
+    assert later.next_fire_ts(7, 30, "UTC", _utc(2026, 12, 1, 8, 0)) == _utc(2026, 12, 8, 7, 30)
+
+
+def test_pop_due_reschedules_repeating_alarms_once():
+    alarms = AlarmQueue()
+    friday = _utc(2024, 5, 3, 6, 0)
+    weekdays = alarms.add(7, 0, friday, "UTC", rule=Rule(weekdays=range(5)))
+    once = alarms.add(7, 0, friday, "UTC")
+
+    # Asleep over the weekend: each fires once and the repeating one skips to Monday
+    fired = alarms.pop_due(_utc(2024, 5, 6, 12, 0))
+    assert sorted(alarm.alarm_id for alarm in fired) == [weekdays, once]
+    assert once not in alarms
+    assert alarms.get(weekdays).fire_ts == _utc(2024, 5, 7, 7, 0)
+    assert alarms.pop_due(_utc(2024, 5, 6, 12, 0)) == []
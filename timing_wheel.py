@@ -0,0 +1,251 @@
+# timing_wheel.py
+import heapq
+import itertools
+import math
+import time
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS  # 64 slots per level
+SLOT_MASK = SLOTS - 1
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck). Level 0 has one slot per tick,
+    each higher level covers 64x the span of the one below it. Entries are kept
+    in per-slot dicts, so insert and cancel are O(1) and each entry is moved at
+    most once per level before it expires.
+
+    Time is measured in integer ticks; TimingWheel itself never reads a clock.
+    """
+
+    def __init__(self, levels=4):
+        self.levels = levels
+        self.current_tick = 0
+        self._wheels = [[{} for _ in range(SLOTS)] for _ in range(levels)]
+        self._overflow = {}     # Expiries beyond the top level's span
+        self._where = {}        # key -> slot dict currently holding it
+        self._span = SLOTS ** levels
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def _place(self, key, expiry_tick):
+        delta = expiry_tick - self.current_tick
+        if delta >= self._span:
+            slot = self._overflow
+        else:
+            level = 0
+            while delta >= SLOTS ** (level + 1):
+                level += 1
+            slot = self._wheels[level][(expiry_tick >> (SLOT_BITS * level)) & SLOT_MASK]
+        slot[key] = expiry_tick
+        self._where[key] = slot
+
+    def insert(self, key, expiry_tick):
+        """Schedules key to expire at expiry_tick (replacing any earlier schedule)."""
+        self.cancel(key)
+        # The current tick's slot has already been processed; never schedule into it
+        self._place(key, max(expiry_tick, self.current_tick + 1))
+
+    def cancel(self, key):
+        """Removes key if it is scheduled. Returns True if it was."""
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del slot[key]
+        return True
+
+    def _cascade(self, slot):
+        entries = list(slot.items())
+        slot.clear()
+        for key, expiry_tick in entries:
+            self._place(key, expiry_tick)
+
+    def advance(self):
+        """Moves one tick forward and returns the keys that expired on it."""
+        self.current_tick += 1
+        tick = self.current_tick
+
+        if tick % self._span == 0 and self._overflow:
+            self._cascade(self._overflow)
+
+        # Highest level first, so entries falling through several levels land in
+        # lower slots before those slots are themselves cascaded on this tick.
+        for level in range(self.levels - 1, 0, -1):
+            if tick & ((1 << (SLOT_BITS * level)) - 1) == 0:
+                self._cascade(self._wheels[level][(tick >> (SLOT_BITS * level)) & SLOT_MASK])
+
+        slot = self._wheels[0][tick & SLOT_MASK]
+        if not slot:
+            return []
+        expired = list(slot)
+        slot.clear()
+        for key in expired:
+            del self._where[key]
+        return expired
+
+    def advance_to(self, target_tick):
+        """Advances up to target_tick and returns every key that expired on the way."""
+        if not self._where:
+            # Nothing scheduled: jump straight there instead of walking empty slots
+            self.current_tick = max(self.current_tick, target_tick)
+            return []
+        expired = []
+        while self.current_tick < target_tick:
+            expired.extend(self.advance())
+        return expired
+
+
+class MultiTimer:
+    """
+    Many independent countdowns keyed by timer id, expired through a TimingWheel.
+    Like the single Timer tab countdown, each running timer keeps an absolute
+    monotonic deadline; the wheel only decides when to look at it.
+    """
+
+    def __init__(self, resolution=0.1, clock=time.monotonic):
+        self.resolution = resolution
+        self._clock = clock
+        self._origin = clock()
+        self._wheel = TimingWheel()
+        self._timers = {}
+        # (wake-up instant, timer_id, deadline) for get_next_wakeup(); stale entries
+        # are skipped lazily, like AlarmQueue's heap
+        self._deadlines = []
+        self._ids = itertools.count(1)
+        # Called with the timer id after every change (e.g. to journal it)
+        self.on_change = None
+
+    def __len__(self):
+        return len(self._timers)
+
+    def _changed(self, timer_id):
+        if self.on_change is not None:
+            self.on_change(timer_id)
+
+    def __contains__(self, timer_id):
+        return timer_id in self._timers
+
+    def _tick_for(self, deadline):
+        # Round deadlines up and the clock down, so a timer never expires early
+        return math.ceil((deadline - self._origin) / self.resolution)
+
+    def create(self, seconds, timer_id=None, remaining=None):
+        """Adds a stopped timer with the given duration (and budget left) and returns its id."""
+        if seconds <= 0:
+            raise ValueError("Timer duration must be positive.")
+        if timer_id is None:
+            timer_id = next(self._ids)
+            while timer_id in self._timers:
+                timer_id = next(self._ids)
+        self.remove(timer_id)
+        self._timers[timer_id] = {
+            "total": seconds,
+            "remaining": seconds if remaining is None else remaining,
+            "deadline": None,
+            "finished": False,
+        }
+        self._changed(timer_id)
+        return timer_id
+
+    def remove(self, timer_id):
+        """Deletes a timer. Returns False if the id is unknown."""
+        self._wheel.cancel(timer_id)
+        if self._timers.pop(timer_id, None) is None:
+            return False
+        self._changed(timer_id)
+        return True
+
+    def start(self, timer_id):
+        """Starts or resumes a timer."""
+        timer = self._timers[timer_id]
+        if timer["deadline"] is not None or timer["remaining"] <= 0:
+            return
+        timer["deadline"] = self._clock() + timer["remaining"]
+        timer["finished"] = False
+        expiry_tick = self._tick_for(timer["deadline"])
+        self._wheel.insert(timer_id, expiry_tick)
+        if len(self._deadlines) > 2 * len(self._timers) + 64:
+            # Drop entries of timers that were since stopped, restarted or removed
+            self._deadlines = [entry for entry in self._deadlines
+                               if entry[2] == self._timers.get(entry[1], {}).get("deadline")]
+            heapq.heapify(self._deadlines)
+        heapq.heappush(self._deadlines, (self._origin + expiry_tick * self.resolution, timer_id, timer["deadline"]))
+        self._changed(timer_id)
+
+    def stop(self, timer_id):
+        """Pauses a timer, keeping the remaining budget."""
+        timer = self._timers[timer_id]
+        if timer["deadline"] is None:
+            return
+        timer["remaining"] = max(timer["deadline"] - self._clock(), 0)
+        timer["deadline"] = None
+        self._wheel.cancel(timer_id)
+        self._changed(timer_id)
+
+    def reset(self, timer_id):
+        """Stops a timer and restores its full duration."""
+        timer = self._timers[timer_id]
+        self._wheel.cancel(timer_id)
+        timer["remaining"] = timer["total"]
+        timer["deadline"] = None
+        timer["finished"] = False
+        self._changed(timer_id)
+
+    def get_deadline(self, timer_id):
+        """Returns the monotonic deadline of a running timer, or None."""
+        return self._timers[timer_id]["deadline"]
+
+    def get_total(self, timer_id):
+        return self._timers[timer_id]["total"]
+
+    def is_finished(self, timer_id):
+        return self._timers[timer_id]["finished"]
+
+    def get_remaining(self, timer_id):
+        timer = self._timers[timer_id]
+        if timer["deadline"] is not None:
+            return max(timer["deadline"] - self._clock(), 0)
+        return timer["remaining"]
+
+    def get_status(self, timer_id):
+        """Returns the same status strings as ClockModel.get_timer_status()."""
+        timer = self._timers[timer_id]
+        if timer["finished"]:
+            return "TIMER FINISHED!"
+        elif timer["deadline"] is not None:
+            return "RUNNING"
+        return "READY"
+
+    def list(self):
+        """Returns (timer_id, remaining seconds, status) for every timer."""
+        return [(timer_id, self.get_remaining(timer_id), self.get_status(timer_id))
+                for timer_id in self._timers]
+
+    def get_next_wakeup(self):
+        """Returns the monotonic instant at which tick() will expire the next timer, or None."""
+        deadlines = self._deadlines
+        while deadlines:
+            wake_at, timer_id, deadline = deadlines[0]
+            timer = self._timers.get(timer_id)
+            if timer is not None and timer["deadline"] == deadline:
+                return wake_at
+            heapq.heappop(deadlines)
+        return None
+
+    def tick(self):
+        """Expires every timer whose deadline has passed and returns their ids."""
+        finished = []
+        for timer_id in self._wheel.advance_to(
+                math.floor((self._clock() - self._origin) / self.resolution)):
+            timer = self._timers[timer_id]
+            timer["remaining"] = 0
+            timer["deadline"] = None
+            timer["finished"] = True
+            finished.append(timer_id)
+            self._changed(timer_id)
+        return finished
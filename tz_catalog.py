@@ -0,0 +1,87 @@
+# tz_catalog.py
+import bisect
+import re
+
+import pytz
+
+_TOKEN_SPLIT = re.compile(r"[\s/_\-()+,.]+")
+
+
+def _tokens(text):
+    return [token for token in _TOKEN_SPLIT.split(text.lower()) if token]
+
+
+class TimezoneCatalog:
+    """
+    Every IANA zone known to pytz (canonical names and backward-compatible
+    aliases such as "US/Eastern"), plus any extra display names, searchable by
+    word prefix. The index is a sorted list of (token, entry) pairs, so a prefix
+    lookup is two bisects plus the matching slice.
+    """
+
+    def __init__(self, extra_names=None):
+        # entry -> IANA zone (None for "Local Time")
+        self._zones = {}
+        for name, zone in (extra_names or {}).items():
+            self._zones[name] = zone
+        canonical = set(pytz.common_timezones)
+        for zone in pytz.all_timezones:
+            self._zones.setdefault(zone, zone)
+        self._order = {entry: i for i, entry in enumerate(self._zones)}
+        # Extra names first, then canonical zones, then aliases
+        self._rank = {entry: (0 if entry in (extra_names or {}) else 1 if entry in canonical else 2)
+                      for entry in self._zones}
+
+        index = []
+        for entry in self._zones:
+            words = set(_tokens(entry))
+            # "America/Argentina/Buenos_Aires" is also findable as "buenos aires"
+            city = entry.rsplit("/", 1)[-1].replace("_", " ").lower()
+            words.add(city)
+            words.add(entry.lower())
+            index.extend((word, entry) for word in words)
+        index.sort()
+        self._all_ranked = sorted(self._zones, key=lambda entry: (self._rank[entry], self._order[entry]))
+        self._keys = [word for word, _ in index]
+        self._entries = [entry for _, entry in index]
+
+    def __len__(self):
+        return len(self._zones)
+
+    def __contains__(self, entry):
+        return entry in self._zones
+
+    def resolve(self, entry):
+        """Returns the IANA zone for a catalog entry (None for local time)."""
+        return self._zones[entry]
+
+    def _prefix_matches(self, prefix):
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff", lo)
+        return set(self._entries[lo:hi])
+
+    def search(self, query, limit=50):
+        """Returns up to 'limit' entries whose words start with every word of the query."""
+        query = query.strip().lower()
+        words = _tokens(query)
+        if not words:
+            return self._all_ranked[:limit]
+        else:
+            # Whole-query prefix ("america/new", "new york") or every word matching somewhere
+            matches = self._prefix_matches(words[0])
+            for word in words[1:]:
+                matches &= self._prefix_matches(word)
+            matches |= self._prefix_matches(query)
+        ranked = sorted(matches, key=lambda entry: (self._rank[entry], self._order[entry]))
+        return ranked[:limit]
+
+
+_catalog = None
+
+
+def get_catalog(extra_names=None):
+    """Builds the catalog on first use only, so startup never pays for it."""
+    global _catalog
+    if _catalog is None:
+        _catalog = TimezoneCatalog(extra_names)
+    return _catalog
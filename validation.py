@@ -0,0 +1,115 @@
+# validation.py
+# Input rules for alarms and timers, shared by the Tk entries, the headless
+# command line and anything else that sets alarms or timers from text.
+
+
+class InputError(ValueError):
+    """Rejected input. 'title'/'message' are what the GUI shows; 'field' is the offending entry (None = all)."""
+
+    def __init__(self, title, message, field=None):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+        self.field = field
+
+
+def _digits(*texts):
+    # isdigit() also accepts "²" or "١", which int() then rejects or reads as another number
+    return all(text.isdecimal() and text.isascii() for text in texts)
+
+
+def parse_alarm_time(hour_raw, minute_raw):
+    """Validates alarm entry text and returns (hour, minute)."""
+    hour_raw = hour_raw.strip()
+    minute_raw = minute_raw.strip()
+
+    if not _digits(hour_raw, minute_raw):
+        raise InputError("Invalid Input", "Alarm time must contain only digits.")
+
+    hour = int(hour_raw)
+    minute = int(minute_raw)
+
+    if not (0 <= hour <= 23):
+        raise InputError("Invalid Hour", "Hour must be between 00 and 23.", "hour")
+
+    if not (0 <= minute <= 59):
+        raise InputError("Invalid Minute", "Minutes must be between 00 and 59.", "minute")
+
+    return hour, minute
+
+
+def parse_timer_duration(h_raw, m_raw, s_raw):
+    """Validates timer entry text and returns (hours, minutes, seconds)."""
+    h_raw = h_raw.strip()
+    m_raw = m_raw.strip()
+    s_raw = s_raw.strip()
+
+    if not _digits(h_raw, m_raw, s_raw):
+        raise InputError("Invalid Input", "Timer fields must contain digits only.")
+
+    hours = int(h_raw)
+    minutes = int(m_raw)
+    seconds = int(s_raw)
+
+    if not (0 <= hours <= 99):
+        raise InputError("Invalid Hours", "Hours must be between 00 and 99.", "hour")
+
+    if not (0 <= minutes <= 59):
+        raise InputError("Invalid Minutes", "Minutes must be between 00 and 59.", "minute")
+
+    if not (0 <= seconds <= 59):
+        raise InputError("Invalid Seconds", "Seconds must be between 00 and 59.", "second")
+
+    return hours, minutes, seconds
+
+
+def parse_clock_text(text, parts):
+    """Splits 'HH:MM' (parts=2) or 'HH:MM:SS' (parts=3) into raw fields for the parsers above."""
+    fields = text.split(":")
+    if len(fields) != parts:
+        expected = "HH:MM" if parts == 2 else "HH:MM:SS"
+        raise InputError("Invalid Input", f"Expected {expected}, got '{text}'.")
+    return fields
+
+
+def _parse_command_duration(message):
+    hours, minutes, seconds = parse_timer_duration(*parse_clock_text(str(message.get("duration", "")), 3))
+    if hours == minutes == seconds == 0:
+        raise InputError("Invalid Timer", "Timer duration must be positive.")
+    return hours, minutes, seconds
+
+
+def parse_command(message):
+    """
+    Validates a command sent by another launch or a local client, e.g.
+    {"cmd": "alarm", "time": "07:30"}, and returns it as the tuple that
+    ClockController.apply_command() takes. Commands: focus, alarm (time,
+    optional repeat, e.g. "weekdays"; see recurrence.parse_rule), timer (duration; the Timer tab), add_timer (duration; an extra timer),
+    remove_alarm (id), remove_timer (id).
+    """
+    if not isinstance(message, dict):
+        raise InputError("Invalid Command", "A command must be a JSON object.")
+    name = message.get("cmd")
+
+    if name == "focus":
+        return ("focus",)
+    elif name == "alarm":
+        hour, minute = parse_alarm_time(*parse_clock_text(str(message.get("time", "")), 2))
+        rule = None
+        if message.get("repeat"):
+            # Imported here: recurrence loads pytz, which a forwarding launch never needs
+            from recurrence import parse_rule
+            rule = parse_rule(str(message["repeat"]))
+        return ("alarm", hour, minute, rule)
+    elif name == "timer":
+        return ("timer",) + _parse_command_duration(message)
+    elif name == "add_timer":
+        hours, minutes, seconds = _parse_command_duration(message)
+        return ("add_timer", hours * 3600 + minutes * 60 + seconds)
+    elif name in ("remove_alarm", "remove_timer"):
+        item_id = message.get("id")
+        # Ids are ints; a string such as "1" would match nothing and be silently ignored
+        if isinstance(item_id, bool) or not isinstance(item_id, int):
+            raise InputError("Invalid Command", f"'{name}' needs an integer 'id'.")
+        return (name, item_id)
+    raise InputError("Invalid Command", f"Unknown command '{name}'.")
@@ -305,7 +305,10 @@
 import tkinter as tk
 from tkinter import ttk
 import os 
+import time
+from tkinter import messagebox
 from tkinter import TclError # Import TclError to handle potential icon errors
+from snapshot import AlarmState, TimerState
 
 # --- Utility Functions for Styling ---
 def configure_styles(root):
@@ -332,12 +335,67 @@ def configure_styles(root):
     style.map("TNotebook.Tab", background=[("selected", "#555555")], foreground=[("selected", "#FFFFFF")])
 
 
+# --- Dirty Tracking ---
+
+_UNSET = object()
+
+
+class WidgetRenderer:
+    """
+    Remembers the last value sent to every (widget, option) pair and only calls
+    .config() for options whose value actually changed, so an unchanged label
+    costs no Tcl round-trip. Also serves as the source of truth for current
+    values (e.g. the flashing colour), replacing cget() calls.
+    """
+
+    def __init__(self):
+        self._last = {}
+        self.tick_sent = 0    # Options pushed to Tcl during the current tick
+        self.tick_saved = 0   # Options skipped because nothing changed
+        self.total_sent = 0
+        self.total_saved = 0
+
+    def begin_tick(self):
+        self.tick_sent = 0
+        self.tick_saved = 0
+
+    def set(self, widget, **options):
+        """Configures only the options whose value differs from the last one rendered."""
+        changed = {}
+        for option, value in options.items():
+            key = (widget, option)
+            if self._last.get(key, _UNSET) != value:
+                self._last[key] = value
+                changed[option] = value
+        saved = len(options) - len(changed)
+        self.tick_saved += saved
+        self.total_saved += saved
+        if changed:
+            self.tick_sent += len(changed)
+            self.total_sent += len(changed)
+            widget.config(**changed)
+
+    def get(self, widget, option, default=None):
+        """Returns the last value rendered for a widget option (no Tcl call)."""
+        value = self._last.get((widget, option), _UNSET)
+        return default if value is _UNSET else value
+
+    def get_stats(self):
+        return {
+            "tick_sent": self.tick_sent,
+            "tick_saved": self.tick_saved,
+            "total_sent": self.total_sent,
+            "total_saved": self.total_saved,
+        }
+
+
 # --- Individual Page Frames (Views) ---
 
 class CurrentTimeFrame(ttk.Frame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, renderer=None):
         super().__init__(parent, style="TFrame", padding="20")
         self.controller = controller
+        self.renderer = renderer if renderer is not None else WidgetRenderer()
 
         # Layout: Grid in a single column
         self.grid_columnconfigure(0, weight=1)
@@ -360,7 +418,8 @@ class CurrentTimeFrame(ttk.Frame):
         # Time Zone Dropdown
         ttk.Label(controls_frame, text="TIME ZONE:", style="Info.TLabel").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.tz_var = tk.StringVar(self)
-        self.tz_combobox = ttk.Combobox(controls_frame, textvariable=self.tz_var, state="readonly", width=20)
+        # Editable so it doubles as a type-ahead search over the full IANA catalog
+        self.tz_combobox = ttk.Combobox(controls_frame, textvariable=self.tz_var, width=20)
         self.tz_combobox.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
         
         # Populate combobox values (must be handled carefully during initialization)
@@ -373,6 +432,8 @@ class CurrentTimeFrame(ttk.Frame):
             self.tz_combobox.set('Loading...')
 
         self.tz_combobox.bind('<<ComboboxSelected>>', self.controller.timezone_selected_action)
+        self.tz_combobox.bind('<KeyRelease>', self.controller.timezone_search_action)
+        self.tz_combobox.bind('<Return>', self.controller.timezone_entered_action)
 
         # Format Button
         self.format_button = ttk.Button(controls_frame, text="CHANGE TIME_FORMAT", command=self.controller.toggle_format_action)
@@ -382,29 +443,31 @@ class CurrentTimeFrame(ttk.Frame):
         self.status_label = ttk.Label(self, text="", style="Info.TLabel")
         self.status_label.grid(row=4, column=0, pady=(15, 0), sticky="ew")
         
-        # Keep a reference to the alarm status for flashing logic
-        self.alarm_status = "ALARM OFF" 
+        # Keep a reference to the alarm state for flashing logic
+        self.alarm_state = AlarmState.OFF
 
-    def update(self, data):
-        self.time_label.config(text=data["time_str"])
-        self.date_label.config(text=data["date_str"])
-        self.status_label.config(text=f"{data['format_status']} | Time Zone: {data['tz_key']}")
-        self.alarm_status = data["alarm_status"]
+    def update(self, snapshot):
+        render = self.renderer.set
+        self.alarm_state = snapshot.alarm_state
         
         # Flashing Alarm Check
-        if "TRIGGERED" in self.alarm_status:
-            current_color = self.time_label.cget("foreground")
+        if self.alarm_state is AlarmState.TRIGGERED:
+            current_color = self.renderer.get(self.time_label, "foreground", "#00ff00")
             # Flashing between red and the normal green
             new_color = "#FF4444" if current_color == "#00ff00" else "#00ff00" 
-            self.time_label.config(foreground=new_color)
         else:
-            self.time_label.config(foreground="#00ff00")
+            new_color = "#00ff00"
+
+        render(self.time_label, text=snapshot.time_str, foreground=new_color)
+        render(self.date_label, text=snapshot.date_str)
+        render(self.status_label, text=f"{snapshot.format_status} | Time Zone: {snapshot.tz_key}")
 
 
 class AlarmFrame(ttk.Frame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, renderer=None):
         super().__init__(parent, style="TFrame", padding="20")
         self.controller = controller
+        self.renderer = renderer if renderer is not None else WidgetRenderer()
 
         self.grid_columnconfigure(0, weight=1)
 
@@ -430,32 +493,42 @@ class AlarmFrame(ttk.Frame):
         self.alarm_minute_var = tk.StringVar(self, value="00")
         self.alarm_minute_entry = ttk.Entry(input_frame, textvariable=self.alarm_minute_var, width=3, justify='center')
         self.alarm_minute_entry.pack(side=tk.LEFT)
+
+        # Repeat Input (a preset or free text such as "mon,wed" / "every 2 days")
+        ttk.Label(input_frame, text="REPEAT:", style="Info.TLabel").pack(side=tk.LEFT, padx=(20, 5))
+        self.alarm_repeat_var = tk.StringVar(self, value="Once")
+        self.alarm_repeat_combobox = ttk.Combobox(input_frame, textvariable=self.alarm_repeat_var, width=14,
+                                                  values=["Once", "Daily", "Weekdays", "Weekends", "Every 2 days"])
+        self.alarm_repeat_combobox.pack(side=tk.LEFT)
         
         # Buttons Frame
         button_frame = ttk.Frame(self, style="TFrame")
         button_frame.grid(row=3, column=0, pady=(20, 0), sticky="ew")
         button_frame.grid_columnconfigure(0, weight=1)
         button_frame.grid_columnconfigure(1, weight=1)
+        button_frame.grid_columnconfigure(2, weight=1)
         
         ttk.Button(button_frame, text="SET ALARM", command=self.controller.set_alarm_action).grid(row=0, column=0, padx=10, sticky="ew")
-        ttk.Button(button_frame, text="CLEAR ALARM", command=self.controller.clear_alarm_action).grid(row=0, column=1, padx=10, sticky="ew")
+        # Silences a triggered alarm but keeps it (and its repeat) set
+        ttk.Button(button_frame, text="DISMISS", command=self.controller.dismiss_alarm_action).grid(row=0, column=1, padx=10, sticky="ew")
+        ttk.Button(button_frame, text="CLEAR ALARM", command=self.controller.clear_alarm_action).grid(row=0, column=2, padx=10, sticky="ew")
 
-    def update(self, data):
-        self.alarm_status_label.config(text=data["alarm_status"])
-        
-        if "TRIGGERED" in data["alarm_status"]:
-            current_color = self.alarm_status_label.cget("foreground")
+    def update(self, snapshot):
+        if snapshot.alarm_state is AlarmState.TRIGGERED:
+            current_color = self.renderer.get(self.alarm_status_label, "foreground", "#FF4444")
             # Flashing between white and red
             new_color = "#FFFFFF" if current_color == "#FF4444" else "#FF4444" 
-            self.alarm_status_label.config(foreground=new_color)
         else:
-            self.alarm_status_label.config(foreground="#FF4444")
+            new_color = "#FF4444"
+
+        self.renderer.set(self.alarm_status_label, text=snapshot.alarm_status, foreground=new_color)
 
 
 class TimerFrame(ttk.Frame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, renderer=None):
         super().__init__(parent, style="TFrame", padding="20")
         self.controller = controller
+        self.renderer = renderer if renderer is not None else WidgetRenderer()
         
         self.grid_columnconfigure(0, weight=1)
 
@@ -504,69 +577,130 @@ class TimerFrame(ttk.Frame):
         self.start_stop_timer_button.grid(row=0, column=1, padx=5, sticky="ew")
         ttk.Button(button_frame, text="RESET", command=self.controller.reset_timer_action).grid(row=0, column=2, padx=5, sticky="ew")
 
-    def update(self, data):
-        self.timer_label.config(text=data["timer_str"])
-        self.timer_status_label.config(text=data["timer_status"])
-        
-        if "FINISHED" in data["timer_status"]:
-            current_color = self.timer_label.cget("foreground")
+    def update(self, snapshot):
+        if snapshot.timer_state is TimerState.FINISHED:
+            current_color = self.renderer.get(self.timer_label, "foreground", "#66ccff")
             # Flashing between red and blue
             new_color = "#FF4444" if current_color == "#66ccff" else "#66ccff" 
-            self.timer_label.config(foreground=new_color)
-            self.start_stop_timer_button.config(text="START")
-        elif "RUNNING" in data["timer_status"]:
-            self.timer_label.config(foreground="#66ccff")
-            self.start_stop_timer_button.config(text="STOP")
+            button_text = "START"
+        elif snapshot.timer_state is TimerState.RUNNING:
+            new_color = "#66ccff"
+            button_text = "STOP"
         else:
-            self.timer_label.config(foreground="#66ccff")
-            self.start_stop_timer_button.config(text="START")
+            new_color = "#66ccff"
+            button_text = "START"
+
+        render = self.renderer.set
+        render(self.timer_label, text=snapshot.timer_str, foreground=new_color)
+        render(self.timer_status_label, text=snapshot.timer_status)
+        render(self.start_stop_timer_button, text=button_text)
+
+
+class WorldClockFrame(ttk.Frame):
+    COLUMNS = 3
+
+    def __init__(self, parent, controller, renderer=None):
+        super().__init__(parent, style="TFrame", padding="10")
+        self.controller = controller
+        self.renderer = renderer if renderer is not None else WidgetRenderer()
+
+        ttk.Label(self, text="🌐 WORLD CLOCK", style="Header.TLabel").grid(row=0, column=0, columnspan=self.COLUMNS * 3, pady=(0, 10), sticky="ew")
+
+        # One (time, zone info) label pair per city; the city names never change
+        self.time_labels = []
+        self.info_labels = []
+        zone_labels = self.controller.get_world_zone_labels()
+        rows = -(-len(zone_labels) // self.COLUMNS)
+        for i, city in enumerate(zone_labels):
+            row, col = 1 + i % rows, (i // rows) * 3
+            ttk.Label(self, text=city, style="Info.TLabel", font=("Consolas", 9)).grid(row=row, column=col, padx=(8, 2), sticky="w")
+            time_label = ttk.Label(self, text="--:--:--", style="Info.TLabel", font=("Consolas", 9, "bold"), foreground="#00ff00")
+            time_label.grid(row=row, column=col + 1, sticky="w")
+            info_label = ttk.Label(self, text="", style="Info.TLabel", font=("Consolas", 8))
+            info_label.grid(row=row, column=col + 2, padx=(2, 8), sticky="w")
+            self.time_labels.append(time_label)
+            self.info_labels.append(info_label)
+
+    def update(self, snapshot):
+        # Unchanged labels (zone abbreviations, day markers) cost no Tcl call
+        render = self.renderer.set
+        for i, (time_str, abbreviation, day_marker) in enumerate(snapshot.world_times):
+            render(self.time_labels[i], text=time_str)
+            render(self.info_labels[i], text=f"{abbreviation} {day_marker}" if day_marker else abbreviation)
 
 
 # --- Main Application Window ---
 
-class ClockView(tk.Tk):
-    def __init__(self, controller):
-        super().__init__()
+class ClockView(ttk.Frame):
+    """
+    The whole clock UI as one frame. It fills 'master' (an existing Tk root or
+    Toplevel) and takes over that window, so the splash and the clock share one
+    Tcl interpreter and one mainloop. Without a master it creates its own root.
+    """
+
+    def __init__(self, controller, master=None):
+        if master is None:
+            master = tk.Tk()
+        super().__init__(master, style="TFrame")
         self.controller = controller
-        self.title("Professional Time Utility")
-        self.geometry("600x450")
-        self.resizable(False, False)
+        self.window = self.winfo_toplevel()
+        self.window.title("Professional Time Utility")
+        self.window.geometry("600x450")
+        self.window.resizable(False, False)
 
-        configure_styles(self)
-        self.configure(bg="#2b2b2b") # Set root background
+        configure_styles(self.window)
+        self.window.configure(bg="#2b2b2b") # Set root background
+        self.pack(fill="both", expand=True)
 
         # FIX 1: Variable to store the ID of the scheduled 'after' call for cancellation
         self.after_id = None 
+        # One-shot callback booked at the exact timer deadline (see ClockController)
+        self.timer_after_id = None
 
         # ICON FIX: Error handling added for icon loading
         icon_path = os.path.join(r'C:\Users\miste\OneDrive\Desktop\TIME_CLOCK\images', 'clock_image.ico')
         if os.path.exists(icon_path):
             try:
-                self.iconbitmap(icon_path)
+                self.window.iconbitmap(icon_path)
             except TclError:
                 print("Warning: Could not load icon. Ensure the path is correct and the file is a valid .ico.")
             
         # FIX 2: Register the clean shutdown handler (CRITICAL FIX for "invalid command name")
-        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # --- 1. Notebook (Tabbed Interface) ---
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True, padx=5, pady=5)
 
+        # Notice line for alarms other than the Alarm tab's (API, imports, ...); only the next notice replaces it
+        self.notice_label = ttk.Label(self, text="", style="Info.TLabel")
+        self.notice_label.pack(fill="x", padx=10, pady=(0, 5))
+
+        # Shared dirty-tracking layer: frames only send Tcl the values that changed
+        self.renderer = WidgetRenderer()
+        self.last_render_stats = self.renderer.get_stats()
+
         # --- 2. Dictionary to hold all page frames ---
         self.frames = {}
         frame_configs = [
             ("Time", CurrentTimeFrame), 
             ("Alarm", AlarmFrame), 
-            ("Timer", TimerFrame)
+            ("Timer", TimerFrame),
+            ("World", WorldClockFrame)
         ]
         
         for name, FrameClass in frame_configs:
-            frame = FrameClass(self.notebook, controller)
+            frame = FrameClass(self.notebook, controller, self.renderer)
             self.frames[name] = frame
             # Add frame as a tab in the notebook
             self.notebook.add(frame, text=name)
 
+        # Only the selected tab is rendered each tick; hidden tabs cost nothing and
+        # are brought up to date in one full sync when they are shown.
+        self.render_visible_only = True
+        self.visible_frame = self.frames["Time"]
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
     def on_closing(self):
         """
         Called when the user attempts to close the window.
@@ -575,13 +709,53 @@ class ClockView(tk.Tk):
         if self.after_id is not None:
             self.after_cancel(self.after_id)
             print("Clean shutdown: Cancelled pending clock update.")
+        if self.timer_after_id is not None:
+            self.after_cancel(self.timer_after_id)
             
-        self.destroy() 
-
-
-    def update_displays(self, data):
-        """Passes the updated data to the update method of ALL frames."""
+        # Closing the clock closes its window (and so ends the shared mainloop)
+        self.window.destroy() 
+
+
+    def focus_window(self):
+        """Brings the clock window to the front (e.g. when the app is launched again)."""
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+
+    def show_error(self, title, message):
+        """Reports invalid input to the user."""
+        messagebox.showerror(title, message, parent=self)
+
+    def show_info(self, title, message):
+        messagebox.showinfo(title, message, parent=self)
+
+    NOTICE_ALARMS = 3  # Alarm times listed on the notice line; the rest are counted
+
+    def notify(self, fired_alarms, finished_timer_ids, timer_finished):
+        """Lists the alarms that rang on the notice line; timers already flash on their tab."""
+        if not fired_alarms:
+            return
+        times = ", ".join(alarm.get_time_string() for alarm in fired_alarms[:self.NOTICE_ALARMS])
+        if len(fired_alarms) > self.NOTICE_ALARMS:
+            times += f" and {len(fired_alarms) - self.NOTICE_ALARMS} more"
+        self.notice_label.configure(text=f"[{time.strftime('%H:%M:%S')}] ALARM {times}")
+
+    def on_tab_changed(self, event):
+        """Resyncs the newly shown frame, which skipped every tick while hidden."""
+        self.visible_frame = self.nametowidget(self.notebook.select())
+        if self.controller.view is self:
+            self.controller.refresh_view()
+
+    def is_frame_visible(self, name):
+        """Returns True if the named frame is rendered on this tick."""
+        return not self.render_visible_only or self.frames[name] is self.visible_frame
+
+    def update_displays(self, snapshot):
+        """Passes the tick's ClockSnapshot to the update method of the visible frame (or ALL frames)."""
+        self.renderer.begin_tick()
         # Use keys matching the Frame class names
-        self.frames["Time"].update(data) 
-        self.frames["Alarm"].update(data)
-        self.frames["Timer"].update(data)
\ No newline at end of file
+        for name, frame in self.frames.items():
+            if self.is_frame_visible(name):
+                frame.update(snapshot)
+        # How many widget option updates this tick sent vs. skipped as unchanged
+        self.last_render_stats = self.renderer.get_stats()
\ No newline at end of file
@@ -0,0 +1,97 @@
+# world_clock.py
+import bisect
+import calendar
+import time
+
+import pytz
+
+from formatting import get_table
+
+DEFAULT_ZONES = [
+    "Pacific/Honolulu", "America/Anchorage", "America/Los_Angeles", "America/Vancouver",
+    "America/Phoenix", "America/Denver", "America/Mexico_City", "America/Chicago",
+    "America/Bogota", "America/Lima", "America/New_York", "America/Toronto",
+    "America/Caracas", "America/Halifax", "America/Santiago", "America/Sao_Paulo",
+    "America/Argentina/Buenos_Aires", "America/St_Johns", "Atlantic/Azores", "UTC",
+    "Europe/London", "Europe/Lisbon", "Africa/Lagos", "Europe/Paris",
+    "Europe/Berlin", "Europe/Madrid", "Europe/Rome", "Europe/Stockholm",
+    "Africa/Cairo", "Africa/Johannesburg", "Europe/Athens", "Europe/Helsinki",
+    "Europe/Istanbul", "Europe/Moscow", "Africa/Nairobi", "Asia/Riyadh",
+    "Asia/Tehran", "Asia/Dubai", "Asia/Karachi", "Asia/Kolkata",
+    "Asia/Kathmandu", "Asia/Dhaka", "Asia/Bangkok", "Asia/Jakarta",
+    "Asia/Singapore", "Asia/Shanghai", "Asia/Hong_Kong", "Australia/Perth",
+    "Asia/Seoul", "Asia/Tokyo", "Australia/Adelaide", "Australia/Brisbane",
+    "Australia/Sydney", "Pacific/Noumea", "Pacific/Auckland", "Pacific/Kiritimati",
+]
+
+
+def zone_labels(zones=DEFAULT_ZONES):
+    """Returns the city part of each zone name, e.g. 'Buenos Aires'. Loads no zone data."""
+    return [zone.rsplit("/", 1)[-1].replace("_", " ") for zone in zones]
+
+
+class ZoneOffsets:
+    """
+    A zone's UTC offset together with the UTC interval it is valid for. pytz's
+    transition table is converted to timestamps once; afterwards the offset is
+    only looked up again when an instant falls outside the cached interval,
+    i.e. at a DST change.
+    """
+
+    def __init__(self, zone):
+        self.zone = zone
+        tz = pytz.timezone(zone)
+        transitions = getattr(tz, "_utc_transition_times", None)
+        if transitions:
+            # The first entry is datetime.min, which timegm cannot represent
+            self._starts = [float("-inf")] + [calendar.timegm(dt.timetuple()) for dt in transitions[1:]]
+            self._infos = [(int(offset.total_seconds()), abbrev)
+                           for offset, _, abbrev in tz._transition_info]
+        else:
+            # Fixed-offset zones (UTC, "EST", "Etc/GMT+5", ...)
+            self._starts = [float("-inf")]
+            self._infos = [(int(tz.utcoffset(None).total_seconds()), tz.tzname(None))]
+        self._valid_from = self._valid_until = 0.0
+        self.offset = 0
+        self.abbreviation = ""
+
+    def update(self, utc_ts):
+        """Makes .offset and .abbreviation valid for utc_ts. Cheap unless a transition passed."""
+        if self._valid_from <= utc_ts < self._valid_until:
+            return
+        i = bisect.bisect_right(self._starts, utc_ts) - 1
+        self.offset, self.abbreviation = self._infos[i]
+        self._valid_from = self._starts[i]
+        self._valid_until = self._starts[i + 1] if i + 1 < len(self._starts) else float("inf")
+
+
+class WorldClock:
+    """
+    Computes the wall time of many zones from a single UTC instant. The zone
+    files are only loaded on the first compute().
+    """
+
+    def __init__(self, zones=DEFAULT_ZONES):
+        self.zones = list(zones)
+        self._offsets = None
+
+    def get_zone_labels(self):
+        return zone_labels(self.zones)
+
+    def compute(self, utc_ts, is_24_hour_format=True):
+        """
+        Returns one (time string, abbreviation, day marker) tuple per zone. The
+        day marker is '+1'/'-1' when the zone's date differs from local time.
+        """
+        whole = int(utc_ts)
+        local_day = (whole + time.localtime(whole).tm_gmtoff) // 86400
+        table = get_table("24" if is_24_hour_format else "12")
+        if self._offsets is None:
+            self._offsets = [ZoneOffsets(zone) for zone in self.zones]
+        rows = []
+        for offsets in self._offsets:
+            offsets.update(whole)
+            day, second_of_day = divmod(whole + offsets.offset, 86400)
+            shift = day - local_day
+            rows.append((table[second_of_day], offsets.abbreviation, f"{shift:+d}" if shift else ""))
+        return rows